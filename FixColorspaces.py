@@ -24,7 +24,15 @@ bl_info = {
     "category": "Material",
 }
 
+import os
+import re
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Set, Tuple
 import bpy
+from bpy.app.handlers import persistent
+from bpy.props import BoolProperty, EnumProperty
 from bpy.types import Image, Operator, Panel, ShaderNodeTree
 
 KEYWORDS = (
@@ -34,6 +42,212 @@ KEYWORDS = (
     'displace', 'disp', 'dsp', 'height', 'heightmap', 'transmission', 'transparency', 'alpha', 'ao ambient', 'occlusion'
 )
 
+# One pass over the name instead of one substring scan per keyword
+KEYWORDS_RE = re.compile('|'.join(map(re.escape, KEYWORDS)))
+
+
+@lru_cache(maxsize=None)
+def is_non_color(name: str) -> bool:
+    """Check if an image name contains any of the KEYWORDS"""
+    return KEYWORDS_RE.search(name.lower()) is not None
+
+
+# Header probing, used for images whose name has no keyword
+PROBE_WORKERS = 16
+# Only the start of each file is read
+PROBE_BYTES = 1 << 16
+
+_probe_cache: Dict[Tuple[str, float, int], Optional[bool]] = {}
+
+
+def _probe_png(data: bytes) -> Optional[bool]:
+    if data[12:16] != b'IHDR':
+        return None
+    bit_depth, color_type = data[24], data[25]
+    if color_type in (0, 4):
+        # Grayscale (+ alpha) is a data map
+        return True
+    if bit_depth == 8:
+        # RGB, RGBA or palette in 8 bit is a color texture
+        return False
+    return None
+
+
+def _probe_exr(data: bytes) -> Optional[bool]:
+    pos = 8
+    while pos < len(data) and data[pos]:
+        name_end = data.index(b'\0', pos)
+        type_end = data.index(b'\0', name_end + 1)
+        name = data[pos:name_end]
+        size, = struct.unpack_from('<i', data, type_end + 1)
+        value = type_end + 5
+        if name == b'channels':
+            channels = []
+            while data[value]:
+                channel_end = data.index(b'\0', value)
+                pixel_type, = struct.unpack_from('<i', data, channel_end + 1)
+                channels.append((data[value:channel_end], pixel_type))
+                value = channel_end + 17
+            if not channels:
+                return None
+            if len(channels) == 1 or {c for c, _ in channels} <= {b'Y', b'A', b'Z'}:
+                return True
+            # HALF and FLOAT hold linear values, only UINT is ambiguous
+            if all(pixel_type == 0 for _, pixel_type in channels):
+                return None
+            return True
+        pos = value + size
+    return None
+
+
+def _probe_tiff(data: bytes) -> Optional[bool]:
+    order = '<' if data[:2] == b'II' else '>'
+    magic, ifd = struct.unpack_from(order + 'HI', data, 2)
+    if magic != 42:
+        return None
+    count, = struct.unpack_from(order + 'H', data, ifd)
+    bits = samples = 1
+    sample_format = 1
+    for i in range(count):
+        tag, kind, values, value = struct.unpack_from(order + 'HHI4s', data, ifd + 2 + i*12)
+        if kind != 3:
+            continue
+        # Up to 2 SHORT values are stored inline, more are stored at an offset.
+        # Only the first sample's value is needed
+        if values > 2:
+            offset, = struct.unpack(order + 'I', value)
+            short, = struct.unpack_from(order + 'H', data, offset)
+        else:
+            short, = struct.unpack_from(order + 'H', value)
+        if tag == 258:
+            bits = short
+        elif tag == 277:
+            samples = short
+        elif tag == 339:
+            sample_format = short
+    if samples == 1 or sample_format == 3:
+        return True
+    if bits == 8:
+        return False
+    return None
+
+
+def _probe_jpeg(data: bytes) -> Optional[bool]:
+    pos = 2
+    while pos + 9 < len(data):
+        if data[pos] != 0xFF:
+            return None
+        marker = data[pos + 1]
+        length, = struct.unpack_from('>H', data, pos + 2)
+        # Start Of Frame, excluding DHT, JPG and DAC markers
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            components = data[pos + 9]
+            return components == 1
+        pos += 2 + length
+    return None
+
+
+_PROBES = (
+    (b'\x89PNG\r\n\x1a\n', _probe_png),
+    (b'\x76\x2f\x31\x01', _probe_exr),
+    (b'II*\0', _probe_tiff),
+    (b'MM\0*', _probe_tiff),
+    (b'\xff\xd8', _probe_jpeg),
+)
+
+
+def probe_file(path: str) -> Optional[bool]:
+    """Classify an image file by its header only
+
+    Results are cached by path, modification time and size
+
+    Returns
+    -------
+    Optional[bool]
+        True for data (non-color) images, False for color images and None
+        when the header doesn't tell
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    key = (path, stat.st_mtime, stat.st_size)
+    if key in _probe_cache:
+        return _probe_cache[key]
+
+    result = None
+    try:
+        with open(path, 'rb') as f:
+            data = f.read(PROBE_BYTES)
+        for magic, probe in _PROBES:
+            if data.startswith(magic):
+                result = probe(data)
+                break
+    except (OSError, ValueError, IndexError, struct.error):
+        result = None
+    _probe_cache[key] = result
+    return result
+
+
+def probe_images(images: Iterable[Image]) -> Dict[Image, Optional[bool]]:
+    """Classify images from their file headers in a thread pool, no pixels are loaded"""
+    paths = {}
+    for image in images:
+        if image.source == 'FILE' and not image.packed_file and image.filepath:
+            paths[image] = os.path.normpath(bpy.path.abspath(image.filepath, library=image.library))
+    with ThreadPoolExecutor(PROBE_WORKERS) as pool:
+        results = pool.map(probe_file, paths.values())
+    return dict(zip(paths.keys(), results))
+
+
+def tree_images(node_trees: Iterable[ShaderNodeTree], visited: Set[ShaderNodeTree]) -> Set[Image]:
+    """Collect the images of every Image Texture node in `node_trees` and their nested groups
+
+    Parameters
+    ----------
+    node_trees : Iterable[ShaderNodeTree]
+    visited : Set[ShaderNodeTree]
+        Trees that were already searched, updated in place so shared groups are only searched once
+    """
+    images = set()
+    stack = list(node_trees)
+    while stack:
+        node_tree = stack.pop()
+        if node_tree in visited:
+            continue
+        visited.add(node_tree)
+        for node in node_tree.nodes:
+            if node.type == 'TEX_IMAGE':
+                if node.image:
+                    images.add(node.image)
+            elif node.type == 'GROUP' and node.node_tree:
+                stack.append(node.node_tree)
+    return images
+
+
+def selected_images(context) -> Set[Image]:
+    """Images used by the materials of the selected objects"""
+    node_trees = set()
+    for obj in context.selected_objects:
+        for slot in obj.material_slots:
+            material = slot.material
+            if material and material.use_nodes and material.node_tree:
+                node_trees.add(material.node_tree)
+    return tree_images(node_trees, set())
+
+
+def fix_images(images: Iterable[Image], color_space: str, non_color_space: str, probe_headers: bool = False) -> None:
+    """Set the color space of each image from its name, and optionally its file header"""
+    probed = {}
+    if probe_headers:
+        probed = probe_images(image for image in images if not is_non_color(image.name))
+    for image in images:
+        non_color = is_non_color(image.name) or bool(probed.get(image))
+        target = non_color_space if non_color else color_space
+        # Assigning the color space reloads the image, even if it's the same
+        if image.colorspace_settings.name != target:
+            image.colorspace_settings.name = target
+
 
 class FixColorSpaceBase:
     bl_options = {'REGISTER', 'UNDO'}
@@ -42,16 +256,21 @@ class FixColorSpaceBase:
     color_space:str
     non_color_space:str
 
+    selected_only: BoolProperty(
+        name="Selected Only",
+        description="Only fix the images used by the selected objects' materials",
+        default=False,
+    )
+
+    probe_headers: BoolProperty(
+        name="Probe Files",
+        description="Classify images without a keyword in their name by reading their file header",
+        default=False,
+    )
+
     def execute(self, context):
-        for image in bpy.data.images:
-            has_keyword = False
-            for keyword in KEYWORDS:
-                if keyword in image.name.lower():
-                    image.colorspace_settings.name = self.non_color_space
-                    has_keyword = True
-                    break
-                if not has_keyword:
-                    image.colorspace_settings.name = self.color_space
+        images = selected_images(context) if self.selected_only else bpy.data.images
+        fix_images(images, self.color_space, self.non_color_space, self.probe_headers)
         return {'FINISHED'}
 
 
@@ -86,9 +305,20 @@ class FixColorSpace_PT_Panel(Panel):
 
     def draw(self, context):
         layout = self.layout
-        layout.operator("scene.apply_filmic_colorspace", text="To Filmic")
-        layout.operator("scene.apply_aces_colorspace", text="To ACES")
-        layout.operator("scene.apply_acescg_colorspace", text="To ACEScg")
+        scene = context.scene
+        row = layout.row()
+        row.prop(scene, "fix_colorspace_auto")
+        row.prop(scene, "fix_colorspace_config", text="")
+        layout.prop(scene, "fix_colorspace_selected_only")
+        layout.prop(scene, "fix_colorspace_probe_headers")
+        for idname, text in (
+            ("scene.apply_filmic_colorspace", "To Filmic"),
+            ("scene.apply_aces_colorspace", "To ACES"),
+            ("scene.apply_acescg_colorspace", "To ACEScg"),
+        ):
+            op = layout.operator(idname, text=text)
+            op.selected_only = scene.fix_colorspace_selected_only
+            op.probe_headers = scene.fix_colorspace_probe_headers
 
 classes = (
     FixColorSpace_OT_Filmic,
@@ -97,14 +327,102 @@ classes = (
     FixColorSpace_PT_Panel,
 )
 
+# Auto mode, fix images as they get added or renamed
+CONFIGS = {
+    'FILMIC': FixColorSpace_OT_Filmic,
+    'ACES': FixColorSpace_OT_ACES,
+    'ACESCG': FixColorSpace_OT_ACEScg,
+}
+
+# Image pointer -> name at the last pass
+_seen_images: Dict[int, str] = {}
+
+
+def auto_fix_pass(scene) -> None:
+    """Fix the images that are new or renamed since the last pass"""
+    current = {image.as_pointer(): image for image in bpy.data.images}
+    images = [image for pointer, image in current.items() if _seen_images.get(pointer) != image.name]
+
+    # Rebuilt every pass so removed images don't linger
+    _seen_images.clear()
+    _seen_images.update((pointer, image.name) for pointer, image in current.items())
+
+    if images:
+        config = CONFIGS[scene.fix_colorspace_config]
+        fix_images(images, config.color_space, config.non_color_space, scene.fix_colorspace_probe_headers)
+
+
+@persistent
+def auto_fix_depsgraph_update_post(scene, depsgraph=None):
+    if depsgraph is not None and not depsgraph.id_type_updated('IMAGE') and len(bpy.data.images) == len(_seen_images):
+        return
+    auto_fix_pass(scene)
+
+
+@persistent
+def auto_fix_load_post(*args):
+    _seen_images.clear()
+    update_auto_fix(bpy.context.scene, bpy.context)
+
+
+def update_auto_fix(self, context):
+    """Add or remove the depsgraph handler to match the scene's auto setting"""
+    handlers = bpy.app.handlers.depsgraph_update_post
+    if self.fix_colorspace_auto:
+        if auto_fix_depsgraph_update_post not in handlers:
+            handlers.append(auto_fix_depsgraph_update_post)
+        auto_fix_pass(self)
+    elif auto_fix_depsgraph_update_post in handlers:
+        handlers.remove(auto_fix_depsgraph_update_post)
+
+
+def update_auto_fix_config(self, context):
+    """Fix every image again with the new color spaces"""
+    _seen_images.clear()
+    if self.fix_colorspace_auto:
+        auto_fix_pass(self)
+
+
 def register():
+    bpy.types.Scene.fix_colorspace_auto = BoolProperty(
+        name="Auto",
+        description="Fix the color space of images as they get added or renamed",
+        update=update_auto_fix,
+    )
+    bpy.types.Scene.fix_colorspace_config = EnumProperty(
+        name="Config",
+        description="Color spaces used by the automatic fix",
+        items=[(key, config.bl_label, "") for key, config in CONFIGS.items()],
+        update=update_auto_fix_config,
+    )
+    bpy.types.Scene.fix_colorspace_selected_only = BoolProperty(
+        name="Selected Only",
+        description="Only fix the images used by the selected objects' materials",
+    )
+    bpy.types.Scene.fix_colorspace_probe_headers = BoolProperty(
+        name="Probe Files",
+        description="Classify images without a keyword in their name by reading their file header",
+    )
     for cls in classes:
         bpy.utils.register_class(cls)
+    # Files saved with auto mode on turn it back on when loaded
+    bpy.app.handlers.load_post.append(auto_fix_load_post)
 
 
 def unregister():
+    for handlers, handler in (
+        (bpy.app.handlers.load_post, auto_fix_load_post),
+        (bpy.app.handlers.depsgraph_update_post, auto_fix_depsgraph_update_post),
+    ):
+        if handler in handlers:
+            handlers.remove(handler)
+    _seen_images.clear()
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
+    del bpy.types.Scene.fix_colorspace_auto
+    del bpy.types.Scene.fix_colorspace_config
+    del bpy.types.Scene.fix_colorspace_selected_only
+    del bpy.types.Scene.fix_colorspace_probe_headers
 
 # Only needed if running from text editor. Remove if installing as an addon.
 if __name__ == "__main__":
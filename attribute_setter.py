@@ -0,0 +1,252 @@
+import bpy
+import numpy as np
+from bpy.types import Mesh
+from typing import Dict, List, NamedTuple, Tuple
+import mesh_buffers
+import benchmark
+
+
+class AttributeSpec(NamedTuple):
+    """How `set_attributes` writes one array"""
+    kind: str = 'ATTRIBUTE'
+    """'POSITION', 'UV', 'NORMALS' (custom split normals) or 'ATTRIBUTE'"""
+    data_type: str = None
+    """Attribute data type, e.g. 'FLOAT_VECTOR'. Inferred from the array if None"""
+    domain: str = None
+    """'POINT', 'EDGE', 'FACE' or 'CORNER'. Inferred from the array length if None"""
+
+
+POSITION = AttributeSpec('POSITION', 'FLOAT_VECTOR', 'POINT')
+UV = AttributeSpec('UV', 'FLOAT2', 'CORNER')
+CUSTOM_NORMALS = AttributeSpec('NORMALS', 'FLOAT_VECTOR', 'CORNER')
+
+# data_type -> (values per element, foreach property, numpy kind)
+DATA_TYPES: Dict[str, Tuple[int, str, str]] = {
+    'FLOAT': (1, 'value', 'f'),
+    'INT': (1, 'value', 'i'),
+    'INT8': (1, 'value', 'i'),
+    'BOOLEAN': (1, 'value', 'b'),
+    'FLOAT2': (2, 'vector', 'f'),
+    'FLOAT_VECTOR': (3, 'vector', 'f'),
+    'FLOAT_COLOR': (4, 'color', 'f'),
+    'BYTE_COLOR': (4, 'color', 'f'),
+}
+# Inferred data type of arrays without one, by numpy kind and values per element
+_INFERRED = {
+    ('f', 1): 'FLOAT', ('f', 2): 'FLOAT2', ('f', 3): 'FLOAT_VECTOR', ('f', 4): 'FLOAT_COLOR',
+    ('i', 1): 'INT', ('u', 1): 'INT', ('b', 1): 'BOOLEAN',
+}
+
+
+def domain_sizes(mesh: Mesh) -> Dict[str, int]:
+    return {
+        'POINT': len(mesh.vertices),
+        'EDGE': len(mesh.edges),
+        'FACE': len(mesh.polygons),
+        'CORNER': len(mesh.loops),
+    }
+
+
+def _resolve(mesh: Mesh, name: str, array: np.ndarray, spec: AttributeSpec, sizes: Dict[str, int]) -> AttributeSpec:
+    """Fill in the blanks of `spec` and check `array` against it"""
+    if spec is None:
+        if name == 'position':
+            spec = POSITION
+        elif name in mesh.uv_layers:
+            spec = UV
+        else:
+            spec = AttributeSpec()
+    kind, data_type, domain = spec
+
+    if kind not in ('POSITION', 'UV', 'NORMALS', 'ATTRIBUTE'):
+        raise ValueError(f"{name}: unknown kind {kind!r}")
+    if array.dtype.kind not in 'fiub':
+        raise ValueError(f"{name}: can't write {array.dtype} arrays")
+
+    existing = mesh.attributes.get(name) if kind == 'ATTRIBUTE' else None
+    if data_type is None:
+        if existing is not None:
+            data_type = existing.data_type
+        else:
+            width = array.shape[-1] if array.ndim > 1 else 1
+            data_type = _INFERRED.get((array.dtype.kind, width))
+            if data_type is None:
+                raise ValueError(f"{name}: can't infer a data type for {array.dtype} arrays shaped {array.shape}")
+    if data_type not in DATA_TYPES:
+        raise ValueError(f"{name}: unsupported data type {data_type!r}")
+    width, _, num_kind = DATA_TYPES[data_type]
+    if num_kind != 'f' and array.dtype.kind == 'f':
+        raise ValueError(f"{name}: {data_type} needs integers, got {array.dtype}")
+
+    if domain is None:
+        if existing is not None and existing.data_type == data_type:
+            domain = existing.domain
+        else:
+            matches = [d for d, size in sizes.items() if size * width == array.size]
+            if len(matches) != 1:
+                raise ValueError(f"{name}: can't infer the domain of {array.size} values, "
+                                 f"matching {matches or 'no domain'}. Pass an AttributeSpec")
+            domain = matches[0]
+    if domain not in sizes:
+        raise ValueError(f"{name}: unknown domain {domain!r}")
+
+    if kind == 'POSITION' and (domain, data_type) != ('POINT', 'FLOAT_VECTOR'):
+        raise ValueError(f"{name}: positions are FLOAT_VECTOR on POINT")
+    if kind == 'UV' and (domain, data_type) != ('CORNER', 'FLOAT2'):
+        raise ValueError(f"{name}: UVs are FLOAT2 on CORNER")
+    if kind == 'NORMALS' and (domain not in ('POINT', 'CORNER') or data_type != 'FLOAT_VECTOR'):
+        raise ValueError(f"{name}: custom normals are FLOAT_VECTOR on POINT or CORNER")
+
+    if array.ndim > 1 and array.shape[-1] != width:
+        raise ValueError(f"{name}: {data_type} has {width} values per element, got arrays shaped {array.shape}")
+    expected = sizes[domain] * width
+    if array.size != expected:
+        raise ValueError(f"{name}: {domain} {data_type} needs {expected} values, got {array.size}")
+    return AttributeSpec(kind, data_type, domain)
+
+
+def _native(array: np.ndarray, data_type: str) -> np.ndarray:
+    num_kind = DATA_TYPES[data_type][2]
+    if num_kind == 'f':
+        return mesh_buffers.as_float(array, "attribute")
+    if num_kind == 'i':
+        return mesh_buffers.as_int(array, "attribute")
+    return np.ascontiguousarray(array, dtype=bool).reshape(-1)
+
+
+def set_attributes(mesh: Mesh, arrays: Dict[str, np.ndarray], specs: Dict[str, AttributeSpec] = None) -> None:
+    """Write many named arrays into `mesh`, one `foreach_set` each
+
+    Every array is checked before anything is written, so a bad array leaves
+    the mesh untouched. Existing layers with a matching type are written in
+    place, layers of another type or domain are replaced.
+
+    'position' is written to the vertex coordinates and arrays named after an
+    existing UV map go to that map. Anything else is a generic attribute,
+    colour attributes included, unless `specs` says otherwise. Data types
+    and domains missing from a spec are inferred from the array's dtype,
+    shape and length.
+
+    Parameters
+    ----------
+    mesh : Mesh
+    arrays : Dict[str, np.ndarray]
+        Attribute name -> values, flat or shaped (n, width)
+    specs : Dict[str, AttributeSpec], None (Optional)
+        How to write some of the arrays, e.g. {'UVMap': UV, 'normals': CUSTOM_NORMALS}
+
+    Raises
+    ------
+    ValueError
+        If an array doesn't fit its attribute
+    """
+    specs = specs or {}
+    sizes = domain_sizes(mesh)
+
+    plan: List[Tuple[str, np.ndarray, AttributeSpec]] = []
+    for name, array in arrays.items():
+        array = np.asanyarray(array)
+        plan.append((name, array, _resolve(mesh, name, array, specs.get(name), sizes)))
+
+    for name, array, (kind, data_type, domain) in plan:
+        if kind == 'POSITION':
+            mesh.vertices.foreach_set("co", _native(array, data_type))
+
+        elif kind == 'UV':
+            uv_layer = mesh.uv_layers.get(name) or mesh.uv_layers.new(name=name)
+            uv_layer.data.foreach_set("uv", _native(array, data_type))
+
+        elif kind == 'NORMALS':
+            # Custom normals only show up with auto smooth before Blender 4.1
+            if hasattr(mesh, "use_auto_smooth"):
+                mesh.use_auto_smooth = True
+            normals = _native(array, data_type).reshape(-1, 3)
+            if domain == 'CORNER':
+                mesh.normals_split_custom_set(normals)
+            else:
+                mesh.normals_split_custom_set_from_vertices(normals)
+
+        else:
+            attr = mesh.attributes.get(name)
+            if attr is not None and (attr.data_type, attr.domain) != (data_type, domain):
+                mesh.attributes.remove(attr)
+                attr = None
+            if attr is None:
+                attr = mesh.attributes.new(name, data_type, domain)
+            attr.data.foreach_set(DATA_TYPES[data_type][1], _native(array, data_type))
+
+
+def check_set_attributes(mesh: Mesh) -> bool:
+    """Write random arrays on every domain of `mesh` and read them back
+
+    Returns
+    -------
+    bool
+        True if every array was written as given and a second call reused the layers
+    """
+    sizes = domain_sizes(mesh)
+    arrays = {
+        'position': np.random.random((sizes['POINT'], 3)),
+        'check_float': np.random.random(sizes['EDGE']),
+        'check_int': np.random.randint(0, 100, sizes['FACE']),
+        'check_color': np.random.random((sizes['CORNER'], 4)).astype(np.float32),
+        'check_uv': np.random.random((sizes['CORNER'], 2)),
+    }
+    specs = {
+        'check_float': AttributeSpec(domain='EDGE'),
+        'check_int': AttributeSpec(domain='FACE'),
+        'check_color': AttributeSpec(domain='CORNER'),
+        'check_uv': UV,
+    }
+    set_attributes(mesh, arrays, specs)
+    layers = len(mesh.attributes)
+    set_attributes(mesh, arrays, specs)
+    reused = layers == len(mesh.attributes)
+
+    def read(seq, prop: str, size: int, dtype: type) -> np.ndarray:
+        out = np.empty(size, dtype=dtype)
+        seq.foreach_get(prop, out)
+        return out
+
+    FLOAT, INT = mesh_buffers.FLOAT, mesh_buffers.INT
+    results = [
+        (arrays['position'], read(mesh.vertices, "co", sizes['POINT']*3, FLOAT)),
+        (arrays['check_float'], read(mesh.attributes['check_float'].data, "value", sizes['EDGE'], FLOAT)),
+        (arrays['check_int'], read(mesh.attributes['check_int'].data, "value", sizes['FACE'], INT)),
+        (arrays['check_color'], read(mesh.attributes['check_color'].data, "color", sizes['CORNER']*4, FLOAT)),
+        (arrays['check_uv'], read(mesh.uv_layers['check_uv'].data, "uv", sizes['CORNER']*2, FLOAT)),
+    ]
+    same = all(np.allclose(np.ravel(a).astype(FLOAT), b) for a, b in results)
+
+    for name in ('check_float', 'check_int', 'check_color'):
+        mesh.attributes.remove(mesh.attributes[name])
+    mesh.uv_layers.remove(mesh.uv_layers['check_uv'])
+    return same and reused
+
+
+def set_attributes_time(mesh: Mesh, repeat: int, number: int) -> None:
+    """Time writing a position, a colour and a float per face attribute in one call"""
+    sizes = domain_sizes(mesh)
+    arrays = {
+        'position': np.random.random((sizes['POINT'], 3)),
+        'color': np.random.random((sizes['CORNER'], 4)),
+        'weight': np.random.random(sizes['FACE']),
+    }
+    specs = {'color': AttributeSpec(domain='CORNER'), 'weight': AttributeSpec(domain='FACE')}
+    print("NUM OF VERTS:", sizes['POINT'], "| NUM OF LOOPS:", sizes['CORNER'])
+    benchmark.print_result(benchmark.run("SET_ATTRIBUTES", set_attributes, (mesh, arrays, specs), "attributes", sizes['POINT'], repeat, number))
+    for name in ('color', 'weight'):
+        mesh.attributes.remove(mesh.attributes[name])
+
+
+if __name__ == "__main__":
+    # Change These
+    runs = 3
+    loops = 10
+
+    me: Mesh = bpy.context.object.data
+
+    print(" STARTING ".center(60, "-"))
+    print("ATTRIBUTES READ BACK:", check_set_attributes(me))
+    set_attributes_time(me, runs, loops)
+    print(" FINISHED ".center(60, "-"))
@@ -0,0 +1,476 @@
+import bpy
+import csv
+import json
+import os
+import statistics
+import sys
+import tracemalloc
+from dataclasses import asdict, dataclass, fields
+from timeit import default_timer as dt
+from itertools import combinations
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+import numpy as np
+from bpy.types import Object
+
+
+@dataclass
+class BenchmarkResult:
+    """Timings of one method, all times are seconds per call"""
+    method: str
+    kind: str
+    vertex_count: int
+    repeat: int
+    number: int
+    mean: float
+    stdev: float
+    median: float
+    min: float
+    max: float
+    blender_version: str
+    # Memory, measured over untimed passes of `memory_iterations` calls
+    memory_iterations: int = 0
+    peak_alloc: int = 0
+    """Peak Python (and NumPy) allocation in bytes, from tracemalloc"""
+    rss_delta: int = 0
+    """Change of the process' resident memory in bytes"""
+    leaked_meshes: int = 0
+    leaked_objects: int = 0
+    leaked_node_groups: int = 0
+
+
+# Untimed calls used to measure memory by default
+MEMORY_ITERATIONS = 3
+
+# name -> func(x, y), generating a x*y grid in the active object
+GRID_METHODS: Dict[str, Callable[[int, int], None]] = {}
+# name -> func(obj, coords), setting the coordinates of obj's mesh
+COORDS_METHODS: Dict[str, Callable[[Object, np.ndarray], None]] = {}
+# primitive -> name -> func(x, y), generating the primitive at resolution x, y in the active object
+PRIMITIVE_METHODS: Dict[str, Dict[str, Callable[[int, int], None]]] = {}
+
+
+def grid_method(name: str) -> Callable:
+    """Decorator registering a grid creation method under `name`"""
+    def register(func: Callable[[int, int], None]) -> Callable[[int, int], None]:
+        GRID_METHODS[name] = func
+        return func
+    return register
+
+
+def coords_method(name: str) -> Callable:
+    """Decorator registering a coordinate setting method under `name`"""
+    def register(func: Callable[[Object, np.ndarray], None]) -> Callable[[Object, np.ndarray], None]:
+        COORDS_METHODS[name] = func
+        return func
+    return register
+
+
+def primitive_method(primitive: str, name: str) -> Callable:
+    """Decorator registering a way to create `primitive` under `name`"""
+    def register(func: Callable[[int, int], None]) -> Callable[[int, int], None]:
+        PRIMITIVE_METHODS.setdefault(primitive, {})[name] = func
+        return func
+    return register
+
+
+def measure(func: Callable, args: tuple = (), repeat: int = 3, number: int = 1, warmup: int = 1) -> List[float]:
+    """Time `func(*args)`
+
+    Parameters
+    ----------
+    func : Callable
+    args : tuple
+    repeat : int
+        Number of runs
+    number : int
+        Calls per run
+    warmup : int
+        Untimed calls before the first run
+
+    Returns
+    -------
+    List[float]
+        Seconds per call of each run
+    """
+    for _ in range(warmup):
+        func(*args)
+    times = []
+    for _ in range(repeat):
+        st = dt()
+        for _ in range(number):
+            func(*args)
+        times.append((dt() - st) / number)
+    return times
+
+
+def rss() -> int:
+    """Resident memory of this process in bytes, 0 if it can't be read"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        # Only the peak is available here, in KiB on Linux and bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+    except ImportError:
+        return 0
+
+
+def datablock_counts() -> Dict[str, int]:
+    return {
+        "meshes": len(bpy.data.meshes),
+        "objects": len(bpy.data.objects),
+        "node_groups": len(bpy.data.node_groups),
+    }
+
+
+def mesh_pointers() -> Set[int]:
+    """Pointers of every mesh that exists now, to tell new meshes apart later"""
+    return {me.as_pointer() for me in bpy.data.meshes}
+
+
+def remove_new_orphans(existing: Set[int]) -> int:
+    """Remove meshes without users that are not in `existing`
+
+    Methods that swap an object's mesh leave the old one behind. Removing them
+    between runs keeps later runs from timing a growing database
+
+    Returns
+    -------
+    int
+        Number of meshes removed
+    """
+    orphans = [me for me in bpy.data.meshes if me.users == 0 and me.as_pointer() not in existing]
+    if orphans:
+        bpy.data.batch_remove(orphans)
+    return len(orphans)
+
+
+def measure_memory(func: Callable, args: tuple = (), iterations: int = 3) -> Dict[str, int]:
+    """Call `func(*args)` `iterations` times and report its memory footprint
+
+    Runs two passes of `iterations` calls. The RSS delta and leaked
+    datablocks come from the first one, without tracemalloc, whose own
+    tables would otherwise show up in the RSS. The peak allocation comes
+    from the second one, traced by tracemalloc.
+
+    Returns
+    -------
+    Dict[str, int]
+        peak_alloc, rss_delta and leaked_<datablock> counts, matching the
+        BenchmarkResult fields
+    """
+    counts = datablock_counts()
+    rss_before = rss()
+    for _ in range(iterations):
+        func(*args)
+    memory = {"rss_delta": rss() - rss_before}
+    for name, count in datablock_counts().items():
+        memory[f"leaked_{name}"] = count - counts[name]
+
+    was_tracing = tracemalloc.is_tracing()
+    if was_tracing:
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+    else:
+        tracemalloc.start()
+        base = 0
+    try:
+        for _ in range(iterations):
+            func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    memory["peak_alloc"] = peak - base
+    return memory
+
+
+def run(method: str,
+        func: Callable,
+        args: tuple = (),
+        kind: str = "",
+        vertex_count: int = 0,
+        repeat: int = 3,
+        number: int = 1,
+        warmup: int = 1,
+        memory_iterations: int = 0) -> BenchmarkResult:
+    """Time `func(*args)` and summarize it, see `measure` for the parameters
+
+    If `memory_iterations` is set, `measure_memory` runs after the timing so
+    tracemalloc doesn't slow down the timed calls
+    """
+    times = measure(func, args, repeat, number, warmup)
+    memory = measure_memory(func, args, memory_iterations) if memory_iterations else {}
+    return BenchmarkResult(
+        method=method,
+        kind=kind,
+        vertex_count=vertex_count,
+        repeat=repeat,
+        number=number,
+        mean=statistics.mean(times),
+        stdev=statistics.stdev(times) if len(times) > 1 else 0.0,
+        median=statistics.median(times),
+        min=min(times),
+        max=max(times),
+        blender_version=bpy.app.version_string,
+        memory_iterations=memory_iterations,
+        **memory,
+    )
+
+
+def print_result(result: BenchmarkResult) -> None:
+    print(f'{result.method}: {result.mean:.6f} s ± {result.stdev:.6f} s per call')
+    print(f'    (mean ± std. dev. of {result.repeat} runs, {result.number} calls each)')
+    print(f'    (Median:{result.median:.6f} | Min:{result.min:.6f} | Max:{result.max:.6f})')
+    if result.memory_iterations:
+        print(f'    (Peak alloc:{result.peak_alloc/2**20:.2f} MiB | RSS delta:{result.rss_delta/2**20:.2f} MiB'
+              f' over {result.memory_iterations} calls)')
+        leaks = {
+            "meshes": result.leaked_meshes,
+            "objects": result.leaked_objects,
+            "node_groups": result.leaked_node_groups,
+        }
+        if any(leaks.values()):
+            print('    (Leaked datablocks: ' + ', '.join(f'{name}:{n}' for name, n in leaks.items() if n) + ')')
+
+
+def run_grid_methods(x: int,
+                     y: int,
+                     repeat: int = 3,
+                     number: int = 1,
+                     warmup: int = 1,
+                     methods: Iterable[str] = None,
+                     setup: Optional[Callable[[], None]] = None,
+                     memory_iterations: int = MEMORY_ITERATIONS) -> List[BenchmarkResult]:
+    """Time the registered grid methods and measure their memory
+
+    Parameters
+    ----------
+    x : int
+    y : int
+    methods : Iterable[str], None (Optional)
+        Names of the methods to run, defaults to every registered one
+    setup : Callable, None (Optional)
+        Called before each method, e.g. to restore the active object
+    memory_iterations : int
+        Untimed calls to measure memory over, 0 to skip
+    """
+    results = []
+    existing = mesh_pointers()
+    for name in methods or list(GRID_METHODS):
+        if setup:
+            setup()
+        result = run(name, GRID_METHODS[name], (x, y), "grid", x*y, repeat, number, warmup, memory_iterations)
+        print_result(result)
+        results.append(result)
+        remove_new_orphans(existing)
+    return results
+
+
+def run_coords_methods(obj: Object,
+                       coords: np.ndarray,
+                       repeat: int = 3,
+                       number: int = 1,
+                       warmup: int = 1,
+                       methods: Iterable[str] = None,
+                       memory_iterations: int = MEMORY_ITERATIONS) -> List[BenchmarkResult]:
+    """Time the registered coordinate methods on `obj` and measure their memory
+
+    Methods are looked up by name, `methods` defaults to every registered one
+    """
+    results = []
+    existing = mesh_pointers()
+    for name in methods or list(COORDS_METHODS):
+        func = COORDS_METHODS[name]
+        # Methods may swap the object's mesh, count the vertices up front
+        result = run(name, func, (obj, coords), "coords", len(obj.data.vertices), repeat, number, warmup, memory_iterations)
+        print_result(result)
+        results.append(result)
+        remove_new_orphans(existing)
+    return results
+
+
+def run_primitive_methods(x: int,
+                          y: int,
+                          repeat: int = 3,
+                          number: int = 1,
+                          warmup: int = 1,
+                          primitives: Iterable[str] = None,
+                          setup: Optional[Callable[[], None]] = None,
+                          memory_iterations: int = MEMORY_ITERATIONS) -> List[BenchmarkResult]:
+    """Time every registered way of creating each primitive
+
+    Results are named '<primitive> <method>' and their vertex count is x*y,
+    each primitive interprets the resolution its own way
+
+    Parameters
+    ----------
+    primitives : Iterable[str], None (Optional)
+        Names of the primitives to run, defaults to every registered one
+    setup : Callable, None (Optional)
+        Called before each method, e.g. to restore the active object
+    """
+    results = []
+    existing = mesh_pointers()
+    for primitive in primitives or list(PRIMITIVE_METHODS):
+        print(f"PRIMITIVE: {primitive}")
+        for name, func in PRIMITIVE_METHODS[primitive].items():
+            if setup:
+                setup()
+            result = run(f"{primitive} {name}", func, (x, y), "primitive", x*y, repeat, number, warmup, memory_iterations)
+            print_result(result)
+            results.append(result)
+            remove_new_orphans(existing)
+    return results
+
+
+def write_results(results: List[BenchmarkResult], path: str) -> None:
+    """Write results as JSON, or CSV if `path` ends with '.csv'"""
+    rows = [asdict(result) for result in results]
+    with open(path, 'w', newline='') as f:
+        if path.lower().endswith('.csv'):
+            writer = csv.DictWriter(f, [field.name for field in fields(BenchmarkResult)])
+            writer.writeheader()
+            writer.writerows(rows)
+        else:
+            json.dump(rows, f, indent=2)
+
+
+def sweep_sides(start: int = 10, stop: int = 2000, num: int = 8) -> List[int]:
+    """Geometrically spaced grid side lengths, 10 to 2000 covers 10² to 2000² vertices"""
+    return sorted({int(round(side)) for side in np.geomspace(start, stop, num)})
+
+
+def sweep_grid_methods(sides: Iterable[int],
+                       repeat: int = 3,
+                       number: int = 1,
+                       warmup: int = 1,
+                       methods: Iterable[str] = None,
+                       setup: Optional[Callable[[], None]] = None,
+                       memory_iterations: int = MEMORY_ITERATIONS) -> List[BenchmarkResult]:
+    """Run `run_grid_methods` on a side*side grid for every side
+
+    Meshes orphaned by a method are removed after it ran, see `remove_new_orphans`
+    """
+    methods = list(methods or GRID_METHODS)
+    results = []
+    for side in sides:
+        print(f"SIDE: {side} | NUM OF VERTS: {side*side}")
+        results += run_grid_methods(side, side, repeat, number, warmup, methods, setup, memory_iterations)
+    return results
+
+
+def sweep_coords_methods(sides: Iterable[int],
+                         prepare: Callable[[int], Object],
+                         cleanup: Callable[[Object], None],
+                         repeat: int = 3,
+                         number: int = 1,
+                         warmup: int = 1,
+                         methods: Iterable[str] = None,
+                         memory_iterations: int = MEMORY_ITERATIONS) -> List[BenchmarkResult]:
+    """Run `run_coords_methods` for every side
+
+    Parameters
+    ----------
+    prepare : Callable[[int], Object]
+        Creates the side*side grid object to set coordinates on
+    cleanup : Callable[[Object], None]
+        Removes that object again. Meshes orphaned on the way are removed
+        after it
+    """
+    methods = list(methods or COORDS_METHODS)
+    results = []
+    existing = mesh_pointers()
+    for side in sides:
+        obj = prepare(side)
+        print(f"SIDE: {side} | NUM OF VERTS: {len(obj.data.vertices)}")
+        coords = np.random.random(len(obj.data.vertices)*3)
+        results += run_coords_methods(obj, coords, repeat, number, warmup, methods, memory_iterations)
+        cleanup(obj)
+        remove_new_orphans(existing)
+    return results
+
+
+@dataclass
+class ScalingFit:
+    """Linear model of a method's time, overhead + per_vertex * vertex_count"""
+    method: str
+    overhead: float
+    per_vertex: float
+
+    def predict(self, vertex_count: int) -> float:
+        return self.overhead + self.per_vertex * vertex_count
+
+
+def fit_scaling(results: List[BenchmarkResult]) -> Dict[str, ScalingFit]:
+    """Fit each method's mean time against its vertex count
+
+    The fit is weighted by 1/time so small meshes count as much as big ones
+    """
+    by_method: Dict[str, List[BenchmarkResult]] = {}
+    for result in results:
+        by_method.setdefault(result.method, []).append(result)
+
+    fits = {}
+    for method, runs in by_method.items():
+        counts = np.array([r.vertex_count for r in runs], dtype=float)
+        times = np.array([r.mean for r in runs])
+        if len(set(counts)) < 2:
+            fits[method] = ScalingFit(method, float(times.mean()), 0.0)
+            continue
+        per_vertex, overhead = np.polyfit(counts, times, 1, w=1/np.maximum(times, 1e-9))
+        fits[method] = ScalingFit(method, float(overhead), float(per_vertex))
+    return fits
+
+
+def find_crossovers(results: List[BenchmarkResult]) -> List[Tuple[str, str, float]]:
+    """Find the vertex counts at which one method overtakes another
+
+    Looks for adjacent measured sizes where the faster of two methods changes
+    and interpolates the crossing in log space.
+
+    Returns
+    -------
+    List[Tuple[str, str, float]]
+        (method becoming faster, method it overtakes, vertex count)
+    """
+    times: Dict[str, Dict[int, float]] = {}
+    for result in results:
+        times.setdefault(result.method, {})[result.vertex_count] = result.mean
+
+    crossovers = []
+    for a, b in combinations(times, 2):
+        counts = sorted(set(times[a]) & set(times[b]))
+        # log(time a / time b), negative while a is faster
+        ratios = [np.log(times[a][n] / times[b][n]) for n in counts]
+        for i in range(1, len(counts)):
+            r0, r1 = ratios[i-1], ratios[i]
+            if (r0 < 0) == (r1 < 0) or r0 == r1:
+                continue
+            n0, n1 = np.log(counts[i-1]), np.log(counts[i])
+            n = float(np.exp(n0 + (n1 - n0) * r0 / (r0 - r1)))
+            faster, slower = (a, b) if r1 < 0 else (b, a)
+            crossovers.append((faster, slower, n))
+    return sorted(crossovers, key=lambda crossover: crossover[2])
+
+
+def print_scaling(results: List[BenchmarkResult]) -> None:
+    """Print each method's fitted scaling and where the methods cross"""
+    print(" Scaling:".rjust(60, '-'))
+    for fit in fit_scaling(results).values():
+        print(f'{fit.method}: {fit.overhead:.6f} s + {fit.per_vertex*1e6:.6f} s per 1M verts')
+    print(" Crossovers:".rjust(60, '-'))
+    crossovers = find_crossovers(results)
+    for faster, slower, n in crossovers:
+        print(f'{faster} overtakes {slower} at ~{int(n)} verts (~{int(n**0.5)}²)')
+    if not crossovers:
+        print("None in the measured range")
@@ -0,0 +1,136 @@
+import bpy
+import bmesh
+import numpy as np
+from bpy.types import Collection, Mesh, Object
+from timeit import default_timer as dt
+from typing import List
+from mesh_builder import from_numpy
+import numpy_primitives
+
+
+def cube_mesh(name: str = "Cube", size: float = 1.0) -> Mesh:
+    """Create a cube mesh through the NumPy path"""
+    me: Mesh = bpy.data.meshes.new(name)
+    from_numpy(me, **numpy_primitives.cube(size)._asdict())
+    return me
+
+
+def create_objects(mesh: Mesh,
+                   count: int,
+                   name: str = "Object",
+                   collection: Collection = None,
+                   share_mesh: bool = True,
+                   locations: np.ndarray = None) -> List[Object]:
+    """Create `count` objects using `mesh` in one pass
+
+    The objects are linked to a new collection that is only linked to
+    `collection` once all of them exist. Linking into a collection that is
+    not part of any view layer skips the view layer resync every link would
+    otherwise trigger.
+
+    Parameters
+    ----------
+    mesh : Mesh
+        The template geometry
+    count : int
+        Number of objects to create
+    name : str
+        Name of the objects and of their new collection
+    collection : Collection, None (Optional)
+        Parent of the new collection. Defaults to the scene's collection
+    share_mesh : bool
+        If True every object uses `mesh`, otherwise each gets a copy
+    locations : np.ndarray, None (Optional)
+        Object locations shaped (count, 3)
+
+    Returns
+    -------
+    List[Object]
+        The created objects
+    """
+    if collection is None:
+        collection = bpy.context.scene.collection
+    if locations is not None and len(locations) != count:
+        raise ValueError(f"Got {len(locations)} locations for {count} objects")
+
+    batch: Collection = bpy.data.collections.new(name)
+    new_object = bpy.data.objects.new
+    link = batch.objects.link
+
+    objects = []
+    for _ in range(count):
+        obj = new_object(name, mesh if share_mesh else mesh.copy())
+        link(obj)
+        objects.append(obj)
+
+    if locations is not None:
+        for obj, location in zip(objects, np.asarray(locations).tolist()):
+            obj.location = location
+
+    collection.children.link(batch)
+    return objects
+
+
+def create_cubes(count: int,
+                 size: float = 1.0,
+                 collection: Collection = None,
+                 share_mesh: bool = True,
+                 locations: np.ndarray = None) -> List[Object]:
+    """Create `count` cube objects from a single NumPy built template"""
+    return create_objects(cube_mesh("Cube", size), count, "Cube", collection, share_mesh, locations)
+
+
+def create_cubes_loop(count: int, collection: Collection = None) -> List[Object]:
+    """Create cubes one bmesh at a time, the way ModalTimerOperator used to
+
+    The objects are linked like `create_objects` does, so both are timed doing the same work
+    """
+    if collection is None:
+        collection = bpy.context.scene.collection
+    batch: Collection = bpy.data.collections.new("test")
+
+    objects = []
+    for _ in range(count):
+        me = bpy.data.meshes.new("test")
+        obj = bpy.data.objects.new("test", me)
+        bm = bmesh.new()
+        bmesh.ops.create_cube(bm, size=1.0)
+        bm.to_mesh(me)
+        bm.free()
+        batch.objects.link(obj)
+        objects.append(obj)
+
+    collection.children.link(batch)
+    return objects
+
+
+def remove_objects(objects: List[Object]) -> None:
+    """Remove objects along with their meshes and collections in one batch"""
+    ids = set(objects)
+    for obj in objects:
+        ids.add(obj.data)
+        ids.update(obj.users_collection)
+    ids.discard(bpy.context.scene.collection)
+    bpy.data.batch_remove(ids)
+
+
+def bulk_objects_time(counts=(1_000, 10_000, 100_000)) -> None:
+    """Time `create_cubes` against the per-cube bmesh loop"""
+    for count in counts:
+        print("NUM OF OBJECTS:", count)
+        for title, func in (
+            ("BMESH LOOP", create_cubes_loop),
+            ("BULK SHARED", lambda n: create_cubes(n)),
+            ("BULK COPIES", lambda n: create_cubes(n, share_mesh=False)),
+        ):
+            st = dt()
+            objects = func(count)
+            total = dt() - st
+            print(f'    {title}: {round(total, 3)} s ({round(count/total, 2)} objects/s)')
+            remove_objects(objects)
+
+
+if __name__ == "__main__":
+    print(" STARTING ".center(60, "-"))
+    bulk_objects_time()
+    print(" FINISHED ".center(60, "-"))
@@ -0,0 +1,138 @@
+from functools import lru_cache
+from typing import NamedTuple
+import numpy as np
+from mesh_buffers import FLOAT, INT
+
+# Number of grid resolutions whose topology is kept around
+TOPOLOGY_CACHE_SIZE = 16
+
+
+class GridTopology(NamedTuple):
+    """Read-only int32 topology arrays of a x*y grid, ready for foreach_set"""
+    faces: np.ndarray
+    """1D array of each face's vertex indices. Length is (y-1)*(x-1)*4"""
+    loop_start: np.ndarray
+    """1D array of each face's first loop index"""
+    loop_total: np.ndarray
+    """1D array of each face's vertex count"""
+    edges: np.ndarray
+    """1D array of each edge's 2 vertex indices. Length is (y*(x-1) + (y-1)*x)*2"""
+    loop_edges: np.ndarray
+    """1D array of each loop's edge index, matching `faces`"""
+
+
+def grid_vertices(x: int, y: int, out: np.ndarray = None) -> np.ndarray:
+    """Coordinates of every vertex in a x*y grid spanning 0 to 1, shaped (y, x, 3)
+
+    Parameters
+    ----------
+    x : int
+    y : int
+    out : np.ndarray, None (Optional)
+        float32 array of x*y*3 elements to write into
+    """
+    if out is None:
+        out = np.empty(x*y*3, dtype=FLOAT)
+    verts = out.reshape([y, x, 3])
+    verts[:, :, 0] = np.linspace(0, 1, x, dtype=FLOAT)
+    verts[:, :, 1] = np.linspace(0, 1, y, dtype=FLOAT)[:, None]
+    verts[:, :, 2] = 0.0
+    return verts
+
+
+def grid_faces(x: int, y: int, out: np.ndarray = None) -> np.ndarray:
+    """Vertex indices of every quad in a x*y grid, shaped ((y-1)*(x-1), 4)
+
+    Parameters
+    ----------
+    x : int
+    y : int
+    out : np.ndarray, None (Optional)
+        int32 array of (y-1)*(x-1)*4 elements to write into
+    """
+    a = np.arange(x-1, dtype=INT)
+    b = a + 1
+    c = a + x
+    d = c + 1
+    if out is None:
+        out = np.empty((y-1)*(x-1)*4, dtype=INT)
+    faces = out.reshape([y-1, x-1, 4])
+    faces[:, :, 0] = a
+    faces[:, :, 1] = b
+    faces[:, :, 2] = d
+    faces[:, :, 3] = c
+
+    # Offset every row of faces by the row's first vertex index
+    faces += (np.arange(y-1, dtype=INT) * x)[:, None, None]
+    return faces.reshape([(y-1)*(x-1), 4])
+
+
+def grid_edges(x: int, y: int) -> np.ndarray:
+    """Vertex indices of every edge in a x*y grid, shaped (y*(x-1) + (y-1)*x, 2)
+
+    Horizontal edges come first, row by row, followed by the vertical edges.
+    """
+    rows = (np.arange(y, dtype=INT) * x)[:, None]
+
+    horizontal = np.empty([y, x-1, 2], dtype=INT)
+    horizontal[:, :, 0] = rows + np.arange(x-1)
+    horizontal[:, :, 1] = horizontal[:, :, 0] + 1
+
+    vertical = np.empty([y-1, x, 2], dtype=INT)
+    vertical[:, :, 0] = rows[:-1] + np.arange(x)
+    vertical[:, :, 1] = vertical[:, :, 0] + x
+
+    return np.concatenate((horizontal.reshape(-1, 2), vertical.reshape(-1, 2)))
+
+
+def grid_loop_edges(x: int, y: int) -> np.ndarray:
+    """Edge index of every loop in a x*y grid, shaped ((y-1)*(x-1), 4)
+
+    Matches the edge order of `grid_edges` and the loop order of `grid_faces`
+    """
+    horizontal = np.arange(y*(x-1), dtype=INT).reshape(y, x-1)
+    vertical = np.arange(y*(x-1), y*(x-1) + (y-1)*x, dtype=INT).reshape(y-1, x)
+
+    loop_edges = np.empty([y-1, x-1, 4], dtype=INT)
+    loop_edges[:, :, 0] = horizontal[:-1]     # a -> b
+    loop_edges[:, :, 1] = vertical[:, 1:]     # b -> d
+    loop_edges[:, :, 2] = horizontal[1:]      # d -> c
+    loop_edges[:, :, 3] = vertical[:, :-1]    # c -> a
+    return loop_edges.reshape([(y-1)*(x-1), 4])
+
+
+@lru_cache(maxsize=TOPOLOGY_CACHE_SIZE)
+def grid_topology(x: int, y: int) -> GridTopology:
+    """Get the topology of a x*y grid
+
+    Results are kept in a LRU cache keyed by resolution, so the arrays are
+    shared between calls and flagged read-only. Use
+    `grid_topology.cache_info()` for hit/miss counters and
+    `grid_topology.cache_clear()` to release the memory.
+
+    Parameters
+    ----------
+    x : int
+        Number of vertices along X
+    y : int
+        Number of vertices along Y
+
+    Returns
+    -------
+    GridTopology
+    """
+    faces = grid_faces(x, y).ravel()
+    faces_len = (y-1)*(x-1)
+
+    # Every face of a grid is a quad
+    loop_total = np.full(faces_len, 4, dtype=INT)
+    loop_start = np.arange(0, faces_len*4, 4, dtype=INT)
+
+    # Grid edges are known in closed form, no need for calc_edges
+    edges = grid_edges(x, y).ravel()
+    loop_edges = grid_loop_edges(x, y).ravel()
+
+    topology = GridTopology(faces, loop_start, loop_total, edges, loop_edges)
+    for array in topology:
+        array.setflags(write=False)
+    return topology
@@ -1,19 +1,170 @@
 from sys import executable as exe
+import sys
+import re
 import subprocess
+import importlib
+import importlib.util
+from importlib import metadata
+from typing import Dict, Iterable, Tuple, Union
 
-def install_module(module_name:str, target:str=None):
+# (requirement, module_name) -> installed, so checks only happen once per session
+_installed: Dict[Tuple[str, str], bool] = {}
+
+_REQUIREMENT = re.compile(r'^\s*([A-Za-z0-9._-]+)\s*(?:(==|!=|>=|<=|>|<)\s*([A-Za-z0-9.]+))?\s*$')
+_COMPARE = {
+  '==': lambda a, b: a == b,
+  '!=': lambda a, b: a != b,
+  '>=': lambda a, b: a >= b,
+  '<=': lambda a, b: a <= b,
+  '>': lambda a, b: a > b,
+  '<': lambda a, b: a < b,
+}
+
+
+def _version(version:str) -> Tuple[int, ...]:
+  """Numeric release parts of a version, '1.24.0rc1' -> (1, 24, 0)"""
+  parts = []
+  for part in version.split('.'):
+    digits = re.match(r'\d+', part)
+    if not digits:
+      break
+    parts.append(int(digits.group()))
+    if digits.end() != len(part):
+      break
+  return tuple(parts)
+
+
+def _compare(installed:str, op:str, wanted:str) -> bool:
+  """Compare two versions, padded with zeros so '1.20' and '1.20.0' are equal"""
+  a, b = _version(installed), _version(wanted)
+  length = max(len(a), len(b))
+  return _COMPARE[op](a + (0,) * (length - len(a)), b + (0,) * (length - len(b)))
+
+
+def is_installed(requirement:str, module_name:str=None) -> bool:
+  """Check if a requirement is met without starting a subprocess
+
+  Parameters
+  ----------
+  requirement : str
+    A distribution name with an optional version constraint, e.g. 'numpy>=1.20'
+  module_name : str, None (Optional)
+    The name to import. If None uses the distribution name with '-' replaced by '_'
+  """
+  key = (requirement, module_name)
+  if key in _installed:
+    return _installed[key]
+
+  match = _REQUIREMENT.match(requirement)
+  if not match:
+    raise ValueError(f"Unsupported requirement: {requirement!r}")
+  name, op, version = match.groups()
+
+  try:
+    installed = importlib.util.find_spec(module_name or name.replace('-', '_')) is not None
+  except ImportError:
+    # Dotted names like 'ruamel.yaml' import their parent, which may be missing too
+    installed = False
+  if installed and op:
+    try:
+      installed = _compare(metadata.version(name), op, version)
+    except metadata.PackageNotFoundError:
+      installed = False
+
+  _installed[key] = installed
+  return installed
+
+
+def ensure_modules(requirements:Iterable[Union[str, Tuple[str, str]]], target:str=None, wheel_dir:str=None) -> bool:
+  """Install every requirement that is not met yet with a single pip call
+
+  Parameters
+  ----------
+  requirements : Iterable[str | Tuple[str, str]]
+    Requirements like 'numpy>=1.20', or (requirement, module_name) when the import name differs
+  target : str, None (Optional)
+    The target file path to install the modules. If None will use the '--user' command
+  wheel_dir : str, None (Optional)
+    Directory of wheels to install from without going online
+
+  Returns
+  -------
+  bool
+    True if every requirement is met
+  """
+  if target and target not in sys.path:
+    sys.path.append(target)
+
+  missing = []
+  for requirement in requirements:
+    requirement, module_name = (requirement, None) if isinstance(requirement, str) else requirement
+    if not is_installed(requirement, module_name):
+      missing.append((requirement, module_name))
+  if not missing:
+    return True
+
+  if importlib.util.find_spec('pip') is None:
+    args = [exe, '-m', 'ensurepip', '--user', '--default-pip']
+    if subprocess.call(args=args):
+      return False
+
+  args = [exe, '-m', 'pip', 'install', f'-t={target}' if target else '--user']
+  if wheel_dir:
+    args += ['--no-index', f'--find-links={wheel_dir}']
+  if subprocess.call(args=args + [requirement for requirement, _ in missing]):
+    return False
+
+  importlib.invalidate_caches()
+  for key in missing:
+    _installed.pop(key, None)
+  return True
+
+
+def install_module(module_name:str, target:str=None, wheel_dir:str=None, upgrade:bool=False) -> bool:
   """Download and install a python library or update.
   Parameters
   ----------
   module_name : str
-    The name of the module to install
+    The name of the module to install, optionally with a version constraint
   target : str, None (Optional)
     The target file path to install the module. If None will use the '--user' command
+  wheel_dir : str, None (Optional)
+    Directory of wheels to install from without going online
+  upgrade : bool
+    Run pip even if the module is already installed
   """
+  if not upgrade:
+    return ensure_modules([module_name], target, wheel_dir)
+
   args = [exe, '-m', 'ensurepip', '--user', '--upgrade', '--default-pip']
   if subprocess.call(args=args):
-      return
+    return False
 
   args = [exe, '-m', 'pip', 'install', f'-t={target}' if target else '--user', '--upgrade', module_name]
+  if wheel_dir:
+    args += ['--no-index', f'--find-links={wheel_dir}']
   if subprocess.call(args=args):
-      return
+    return False
+
+  importlib.invalidate_caches()
+  _installed.pop((module_name, None), None)
+  return True
+
+
+def check_versions() -> bool:
+  """Check that version constraints ignore trailing zeros"""
+  cases = [
+    ('1.20.0', '==', '1.20', True),
+    ('1.20.0', '<=', '1.20', True),
+    ('1.20', '>=', '1.20.0', True),
+    ('1.20.0', '!=', '1.20', False),
+    ('1.20.1', '>', '1.20', True),
+    ('1.24.0rc1', '<', '1.24.1', True),
+  ]
+  return all(_compare(installed, op, wanted) == expected for installed, op, wanted, expected in cases)
+
+
+if __name__ == "__main__":
+  print(" STARTING ".center(60, "-"))
+  print("VERSIONS PADDED:", check_versions())
+  print(" FINISHED ".center(60, "-"))
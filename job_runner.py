@@ -0,0 +1,130 @@
+import bpy
+from typing import Callable, Iterable, Optional
+from timeit import default_timer as dt
+import tracing
+
+
+class JobRunner:
+    """Run an iterable of work items on the main thread in time-budgeted slices
+
+    Each `step` consumes items until `budget_ms` is spent, so the UI keeps
+    redrawing at a fixed rate while the work runs as fast as that allows.
+    Drive it from a modal operator's timer events by calling `step`, or let
+    `start_timer` drive it with `bpy.app.timers`.
+    """
+
+    def __init__(self,
+                 jobs: Iterable,
+                 total: int = None,
+                 budget_ms: float = 10.0,
+                 on_progress: Optional[Callable[['JobRunner'], None]] = None,
+                 on_finish: Optional[Callable[['JobRunner'], None]] = None) -> None:
+        """
+        Parameters
+        ----------
+        jobs : Iterable
+            Work items, usually a generator doing one unit of work per `yield`
+        total : int, None (Optional)
+            Expected number of items, needed for `progress`
+        budget_ms : float
+            Maximum time spent per step in milliseconds
+        on_progress : Callable, None (Optional)
+            Called with the runner after every step
+        on_finish : Callable, None (Optional)
+            Called with the runner once it finished or got cancelled
+        """
+        self._jobs = iter(jobs)
+        self.total = total
+        self.budget = budget_ms / 1000
+        self.on_progress = on_progress
+        self.on_finish = on_finish
+
+        self.done = 0
+        self.finished = False
+        self.cancelled = False
+        self._start = None
+        self._end = None
+        self._interval = 0.0
+        # Timers are matched by identity, keep the one bound method around
+        self._timer = self._tick
+
+    @property
+    def progress(self) -> float:
+        """Finished fraction of `total`, from 0.0 to 1.0"""
+        if self.finished and not self.cancelled:
+            return 1.0
+        if not self.total:
+            return 0.0
+        return min(self.done / self.total, 1.0)
+
+    @property
+    def elapsed(self) -> float:
+        """Wall-clock seconds since the first step"""
+        if self._start is None:
+            return 0.0
+        return (self._end or dt()) - self._start
+
+    @property
+    def rate(self) -> float:
+        """Items per second"""
+        elapsed = self.elapsed
+        return self.done / elapsed if elapsed else 0.0
+
+    @tracing.traced("JobRunner.step")
+    def step(self) -> bool:
+        """Run work items until the time budget is spent
+
+        Returns
+        -------
+        bool
+            True once every item is done or the runner got cancelled
+        """
+        if self.finished:
+            return True
+
+        st = dt()
+        if self._start is None:
+            self._start = st
+        end = st + self.budget
+        jobs = self._jobs
+        try:
+            while True:
+                next(jobs)
+                self.done += 1
+                if dt() >= end:
+                    break
+        except StopIteration:
+            self._finish()
+
+        if self.on_progress:
+            self.on_progress(self)
+        return self.finished
+
+    def cancel(self) -> None:
+        """Stop before the next item"""
+        if not self.finished:
+            self.cancelled = True
+            self._finish()
+
+    def _finish(self) -> None:
+        self.finished = True
+        self._end = dt()
+        print(f"{'Cancelled' if self.cancelled else 'Finished'}: "
+              f"{self.done} items in {round(self.elapsed, 3)} s ({round(self.rate, 2)} items/s)")
+        if self.on_finish:
+            self.on_finish(self)
+
+    def _tick(self) -> Optional[float]:
+        if self.step():
+            return None
+        return self._interval
+
+    def start_timer(self, interval: float = 0.0) -> None:
+        """Drive the runner with `bpy.app.timers`, one step every `interval` seconds"""
+        self._interval = interval
+        bpy.app.timers.register(self._timer, first_interval=interval)
+
+    def stop_timer(self) -> None:
+        """Unregister the timer started with `start_timer`"""
+        if bpy.app.timers.is_registered(self._timer):
+            bpy.app.timers.unregister(self._timer)
@@ -0,0 +1,114 @@
+"""Preallocated native dtype buffers for `foreach_set`
+
+Blender stores coordinates as float32 and indices as int32. Passing any other
+dtype (or a non contiguous array) to `foreach_set` makes Blender convert the
+array element by element. The buffers handed out here already have the
+native dtype, are C-contiguous and are reused between calls, so the only cost
+left is a single memcpy on Blender's side.
+
+A buffer is shared by every caller using the same key. Its content is only
+valid until the next request for that key.
+"""
+from typing import Dict, Tuple
+import numpy as np
+
+FLOAT = np.float32
+INT = np.int32
+
+_buffers: Dict[Tuple[str, type], np.ndarray] = {}
+
+
+def _buffer(key: str, size: int, dtype: type) -> np.ndarray:
+    buf = _buffers.get((key, dtype))
+    if buf is None or len(buf) < size:
+        buf = np.empty(size, dtype=dtype)
+        _buffers[(key, dtype)] = buf
+    return buf[:size]
+
+
+def float_buffer(size: int, key: str = "co") -> np.ndarray:
+    """Get a reusable 1D float32 buffer of `size` elements
+
+    Parameters
+    ----------
+    size : int
+        Number of elements, e.g. vertex count * 3 for coordinates
+    key : str
+        Name of the buffer. Callers using the same key share memory
+
+    Returns
+    -------
+    np.ndarray
+        Uninitialized C-contiguous float32 array
+    """
+    return _buffer(key, size, FLOAT)
+
+
+def int_buffer(size: int, key: str = "indices") -> np.ndarray:
+    """Get a reusable 1D int32 buffer of `size` elements
+
+    Parameters
+    ----------
+    size : int
+        Number of elements, e.g. loop count for face vertex indices
+    key : str
+        Name of the buffer. Callers using the same key share memory
+
+    Returns
+    -------
+    np.ndarray
+        Uninitialized C-contiguous int32 array
+    """
+    return _buffer(key, size, INT)
+
+
+def bool_buffer(size: int, key: str = "mask") -> np.ndarray:
+    """Get a reusable 1D bool buffer of `size` elements, e.g. for comparisons
+
+    Parameters
+    ----------
+    size : int
+        Number of elements
+    key : str
+        Name of the buffer. Callers using the same key share memory
+
+    Returns
+    -------
+    np.ndarray
+        Uninitialized C-contiguous bool array
+    """
+    return _buffer(key, size, bool)
+
+
+def _as_native(array: np.ndarray, key: str, dtype: type) -> np.ndarray:
+    array = np.asanyarray(array)
+    if array.dtype == dtype and array.flags.c_contiguous:
+        # Already native, a flat view costs nothing
+        return array.reshape(-1)
+    buf = _buffer(key, array.size, dtype)
+    # Convert straight into the buffer, no temporary copy
+    np.copyto(buf.reshape(array.shape), array, casting='unsafe')
+    return buf
+
+
+def as_float(array: np.ndarray, key: str = "co") -> np.ndarray:
+    """Get `array` as a flat float32 array that can go straight to `foreach_set`
+
+    Arrays that already are float32 and C-contiguous are returned as a flat
+    view. Anything else is converted in a single pass into the `key` buffer.
+    """
+    return _as_native(array, key, FLOAT)
+
+
+def as_int(array: np.ndarray, key: str = "indices") -> np.ndarray:
+    """Get `array` as a flat int32 array that can go straight to `foreach_set`
+
+    Arrays that already are int32 and C-contiguous are returned as a flat
+    view. Anything else is converted in a single pass into the `key` buffer.
+    """
+    return _as_native(array, key, INT)
+
+
+def clear() -> None:
+    """Release every buffer"""
+    _buffers.clear()
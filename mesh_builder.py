@@ -0,0 +1,185 @@
+import bpy
+import numpy as np
+from bpy.types import Mesh
+from typing import Tuple
+import mesh_buffers
+import benchmark
+
+
+def loop_layout(num_loops: int, face_lengths: np.ndarray = None, offsets: np.ndarray = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Get each face's loop start and loop total as int32
+
+    Parameters
+    ----------
+    num_loops : int
+        Length of the flat face index array
+    face_lengths : np.ndarray, None (Optional)
+        Number of vertices of each face
+    offsets : np.ndarray, None (Optional)
+        CSR style offsets, face i uses indices[offsets[i]:offsets[i+1]].
+        Used when `face_lengths` is None
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        loop_start and loop_total
+    """
+    if face_lengths is not None:
+        loop_total = mesh_buffers.as_int(face_lengths, "loop_total")
+        loop_start = mesh_buffers.int_buffer(len(loop_total), "loop_start")
+        if len(loop_start):
+            loop_start[0] = 0
+            np.cumsum(loop_total[:-1], out=loop_start[1:])
+    elif offsets is not None:
+        offsets = mesh_buffers.as_int(offsets, "offsets")
+        if len(offsets) == 0 or offsets[0] != 0:
+            raise ValueError("Offsets must start at 0")
+        loop_start = offsets[:-1]
+        loop_total = mesh_buffers.int_buffer(len(loop_start), "loop_total")
+        np.subtract(offsets[1:], offsets[:-1], out=loop_total)
+    else:
+        raise ValueError("Either face_lengths or offsets is needed")
+
+    if len(loop_total):
+        if loop_total.min() < 3:
+            raise ValueError("Faces need at least 3 vertices")
+        if int(loop_start[-1]) + int(loop_total[-1]) != num_loops:
+            raise ValueError(f"Faces use {int(loop_start[-1]) + int(loop_total[-1])} indices but {num_loops} were given")
+    elif num_loops:
+        raise ValueError(f"{num_loops} face indices given without any face")
+    return (loop_start, loop_total)
+
+
+def from_numpy(mesh: Mesh,
+               vertices: np.ndarray,
+               faces: np.ndarray,
+               face_lengths: np.ndarray = None,
+               offsets: np.ndarray = None,
+               edges: np.ndarray = None,
+               loop_edges: np.ndarray = None,
+               uvs: np.ndarray = None,
+               uv_name: str = "UVMap") -> None:
+    """Like Blender's mesh.from_pydata but for numpy arrays and any kind of face
+
+    The mesh's geometry is replaced. Every array is written with a single
+    `foreach_set`, in float32/int32 so Blender does not have to convert it.
+
+    Parameters
+    ----------
+    mesh : Mesh
+    vertices : np.ndarray
+        Vertex coordinates shaped (n, 3) or flat
+    faces : np.ndarray
+        1D array of every face's vertex indices, one face after another
+    face_lengths : np.ndarray, None (Optional)
+        Number of vertices of each face
+    offsets : np.ndarray, None (Optional)
+        CSR style offsets of each face into `faces`, with a final entry of
+        len(faces). Used when `face_lengths` is None
+    edges : np.ndarray, None (Optional)
+        Edge vertex indices shaped (n, 2) or flat. Missing face edges are
+        calculated by Blender unless `loop_edges` is given too
+    loop_edges : np.ndarray, None (Optional)
+        Edge index of every loop, matching `faces`. Lets Blender skip
+        calculating the edges entirely. Needs `edges`
+    uvs : np.ndarray, None (Optional)
+        UV coordinates of every loop shaped (len(faces), 2) or flat
+    uv_name : str
+        UV map to write `uvs` to, created if the mesh doesn't have it
+    """
+    if loop_edges is not None and edges is None:
+        raise ValueError("loop_edges needs the edges they index into")
+    faces = mesh_buffers.as_int(faces, "faces")
+    loop_start, loop_total = loop_layout(len(faces), face_lengths, offsets)
+    vertices = mesh_buffers.as_float(vertices, "co")
+
+    mesh.clear_geometry()
+
+    mesh.vertices.add(int(len(vertices)/3))
+    mesh.loops.add(len(faces))
+    mesh.polygons.add(len(loop_total))
+
+    mesh.vertices.foreach_set("co", vertices)
+
+    mesh.polygons.foreach_set("loop_total", loop_total)
+    mesh.polygons.foreach_set("loop_start", loop_start)
+    mesh.polygons.foreach_set("vertices", faces)
+
+    if edges is not None:
+        edges = mesh_buffers.as_int(edges, "edges")
+        mesh.edges.add(int(len(edges)/2))
+        mesh.edges.foreach_set("vertices", edges)
+
+    if uvs is not None:
+        uvs = mesh_buffers.as_float(uvs, "uvs")
+        if len(uvs) != len(faces)*2:
+            raise ValueError(f"Got {len(uvs)//2} UVs for {len(faces)} loops")
+        uv_layer = mesh.uv_layers.get(uv_name) or mesh.uv_layers.new(name=uv_name)
+        uv_layer.data.foreach_set("uv", uvs)
+
+    if edges is not None and loop_edges is not None:
+        mesh.loops.foreach_set("edge_index", mesh_buffers.as_int(loop_edges, "loop_edges"))
+        mesh.update()
+    else:
+        mesh.update(
+            calc_edges=len(loop_total) > 0,
+            calc_edges_loose=edges is not None,
+        )
+
+
+def random_polygons(num_faces: int, sizes=(3, 4, 5, 6, 8)) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Generate disconnected regular polygons of random sizes
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray, np.ndarray]
+        vertices (n, 3), faces and face_lengths
+    """
+    face_lengths = np.random.choice(sizes, num_faces)
+    num_loops = int(face_lengths.sum())
+
+    # Every loop gets its own vertex
+    faces = np.arange(num_loops)
+    face_index = np.repeat(np.arange(num_faces), face_lengths)
+    corner = faces - np.repeat(np.cumsum(face_lengths) - face_lengths, face_lengths)
+    angle = corner / face_lengths[face_index] * 2 * np.pi
+
+    centers = np.random.random((num_faces, 3)) * num_faces ** 0.5
+    vertices = centers[face_index]
+    vertices[:, 0] += np.cos(angle) * 0.4
+    vertices[:, 1] += np.sin(angle) * 0.4
+    return (vertices, faces, face_lengths)
+
+
+def from_numpy_time(num_faces: int, repeat: int, number: int) -> None:
+    """Time `from_numpy` against `Mesh.from_pydata` on mixed tri/quad/n-gon faces"""
+    vertices, faces, face_lengths = random_polygons(num_faces)
+
+    # from_pydata wants python lists, converting is not part of the timing
+    py_verts = vertices.tolist()
+    py_faces = [f.tolist() for f in np.split(faces, np.cumsum(face_lengths)[:-1])]
+
+    def pydata():
+        me = bpy.data.meshes.new("from_pydata")
+        me.from_pydata(py_verts, [], py_faces)
+        bpy.data.meshes.remove(me)
+
+    def numpy_data():
+        me = bpy.data.meshes.new("from_numpy")
+        from_numpy(me, vertices, faces, face_lengths)
+        bpy.data.meshes.remove(me)
+
+    print("NUM OF FACES:", num_faces, "| NUM OF LOOPS:", len(faces))
+    for title, func in (("FROM_PYDATA", pydata), ("FROM_NUMPY", numpy_data)):
+        benchmark.print_result(benchmark.run(title, func, (), "mesh", len(vertices), repeat, number))
+
+
+if __name__ == "__main__":
+    # Change These
+    num_faces = 100_000
+    runs = 3
+    loops = 5
+
+    print(" STARTING ".center(60, "-"))
+    from_numpy_time(num_faces, runs, loops)
+    print(" FINISHED ".center(60, "-"))
@@ -0,0 +1,171 @@
+import bpy
+import json
+import os
+import platform
+import numpy as np
+from bpy.types import Mesh, Object
+from typing import Callable, Dict, List
+import benchmark
+import plane_creation_speed_tests as grids
+import set_coords_test as coords_setters
+
+GRID_BACKENDS: Dict[str, Callable[[int, int], None]] = {
+    "bmesh_op": grids.bmesh_op,
+    "bpy_py": grids.bpy_py,
+    "geo_node": grids.geo_node,
+}
+COORDS_BACKENDS: Dict[str, Callable[[Object, np.ndarray], None]] = {
+    "set_py": coords_setters.set_py_obj,
+    "set_geo_nodes": coords_setters.set_geo_nodes,
+}
+# Used until a calibration exists
+DEFAULT_BACKENDS = {"grid": "bpy_py", "coords": "set_py"}
+
+# Calibrate on first use if this machine and Blender version have no table yet.
+# Off by default, calibrating takes seconds. Call `calibrate` once instead
+AUTO_CALIBRATE = False
+CALIBRATION_FILE = "mesh_dispatch_calibration.json"
+
+# kind -> backend -> ScalingFit
+_table: Dict[str, Dict[str, benchmark.ScalingFit]] = None
+
+
+def calibration_key() -> str:
+    """Calibrations are only valid for one Blender version on one machine"""
+    return f"{bpy.app.version_string}|{platform.node()}|{platform.machine()}|{platform.processor()}"
+
+
+def calibration_path() -> str:
+    return os.path.join(bpy.utils.user_resource('CONFIG'), CALIBRATION_FILE)
+
+
+def _read_calibrations() -> Dict[str, dict]:
+    try:
+        with open(calibration_path()) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def load_calibration() -> Dict[str, Dict[str, benchmark.ScalingFit]]:
+    """Load this machine's calibration table, None if it was never measured"""
+    stored = _read_calibrations().get(calibration_key())
+    if not stored:
+        return None
+    return {
+        kind: {name: benchmark.ScalingFit(name, *fit) for name, fit in fits.items()}
+        for kind, fits in stored.items()
+    }
+
+
+def calibrate(sides: List[int] = None, repeat: int = 2, number: int = 1) -> Dict[str, Dict[str, benchmark.ScalingFit]]:
+    """Measure every backend, save the table to disk and start using it
+
+    Runs on a temporary object that is removed again, along with every mesh
+    the backends orphaned
+
+    Parameters
+    ----------
+    sides : List[int], None (Optional)
+        Grid side lengths to measure
+    repeat : int
+    number : int
+    """
+    global _table
+    if sides is None:
+        sides = benchmark.sweep_sides(10, 1000, 5)
+
+    C = bpy.context
+    active = C.view_layer.objects.active
+    me: Mesh = bpy.data.meshes.new("Calibration")
+    obj: Object = bpy.data.objects.new("Calibration", me)
+    C.scene.collection.objects.link(obj)
+
+    grid_results = []
+    coords_results = []
+    existing = benchmark.mesh_pointers()
+    try:
+        for side in sides:
+            for name, func in GRID_BACKENDS.items():
+                C.view_layer.objects.active = obj
+                grid_results.append(benchmark.run(name, func, (side, side), "grid", side*side, repeat, number))
+                benchmark.remove_new_orphans(existing)
+
+            C.view_layer.objects.active = obj
+            grids.bpy_py(side, side)
+            coords = np.random.random(side*side*3)
+            for name, func in COORDS_BACKENDS.items():
+                coords_results.append(benchmark.run(name, func, (obj, coords), "coords", side*side, repeat, number))
+                benchmark.remove_new_orphans(existing)
+    finally:
+        me = obj.data
+        bpy.data.objects.remove(obj)
+        bpy.data.meshes.remove(me)
+        benchmark.remove_new_orphans(existing)
+        C.view_layer.objects.active = active
+
+    _table = {
+        "grid": benchmark.fit_scaling(grid_results),
+        "coords": benchmark.fit_scaling(coords_results),
+    }
+
+    calibrations = _read_calibrations()
+    calibrations[calibration_key()] = {
+        kind: {name: [fit.overhead, fit.per_vertex] for name, fit in fits.items()}
+        for kind, fits in _table.items()
+    }
+    os.makedirs(os.path.dirname(calibration_path()), exist_ok=True)
+    with open(calibration_path(), 'w') as f:
+        json.dump(calibrations, f, indent=2)
+    return _table
+
+
+def choose_backend(kind: str, vertex_count: int) -> str:
+    """Name of the backend predicted to be fastest for `vertex_count` vertices
+
+    Parameters
+    ----------
+    kind : str
+        'grid' or 'coords'
+    vertex_count : int
+    """
+    global _table
+    if _table is None:
+        _table = load_calibration()
+        if _table is None:
+            if AUTO_CALIBRATE:
+                print("Calibrating mesh backends for", calibration_key())
+                calibrate()
+            else:
+                print("No mesh backend calibration for", calibration_key(),
+                      "- using", DEFAULT_BACKENDS, "until mesh_dispatch.calibrate() is run")
+                _table = {}
+    if not _table or not _table.get(kind):
+        return DEFAULT_BACKENDS[kind]
+    return min(_table[kind].values(), key=lambda fit: fit.predict(vertex_count)).method
+
+
+def make_grid(x: int, y: int) -> str:
+    """Generate a x*y grid in the active object with the fastest backend
+
+    Returns
+    -------
+    str
+        Name of the backend used
+    """
+    backend = choose_backend("grid", x*y)
+    GRID_BACKENDS[backend](x, y)
+    return backend
+
+
+def set_coords(obj: Object, coords: np.ndarray) -> str:
+    """Set the vertex coordinates of `obj` with the fastest backend
+
+    Returns
+    -------
+    str
+        Name of the backend used
+    """
+    backend = choose_backend("coords", len(obj.data.vertices))
+    COORDS_BACKENDS[backend](obj, coords)
+    return backend
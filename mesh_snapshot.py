@@ -0,0 +1,177 @@
+import bpy
+import numpy as np
+from bpy.types import Mesh
+from typing import Dict, Iterable
+import mesh_buffers
+from attribute_setter import DATA_TYPES
+from set_coords_test import set_py
+import benchmark
+
+_DTYPES = {'f': mesh_buffers.FLOAT, 'i': mesh_buffers.INT, 'b': bool}
+
+
+class MeshSnapshot:
+    """Copies of a mesh's coordinates, and optionally normals and attributes
+
+    Every array is owned by the snapshot. Passing it back to `snapshot` as
+    `out` refills the same arrays when the sizes still match.
+    """
+
+    def __init__(self, co: np.ndarray, normals: np.ndarray = None, attributes: Dict[str, np.ndarray] = None) -> None:
+        self.co = co
+        """float32 vertex coordinates shaped (n, 3)"""
+        self.normals = normals
+        """float32 vertex normals shaped (n, 3), None if not taken"""
+        self.attributes = attributes or {}
+        """Attribute name -> values shaped (domain size, width)"""
+
+
+def _read(seq, prop: str, shape: tuple, dtype: type, out: np.ndarray = None) -> np.ndarray:
+    """`foreach_get` into `out` if it fits, otherwise into a new array"""
+    if out is None or out.shape != shape or out.dtype != dtype:
+        out = np.empty(shape, dtype=dtype)
+    seq.foreach_get(prop, out.reshape(-1))
+    return out
+
+
+def snapshot(mesh: Mesh, normals: bool = False, attributes: Iterable[str] = (), out: MeshSnapshot = None) -> MeshSnapshot:
+    """Read a mesh's coordinates with `foreach_get`
+
+    Parameters
+    ----------
+    mesh : Mesh
+    normals : bool
+        Also read the vertex normals
+    attributes : Iterable[str]
+        Names of attributes to read as well
+    out : MeshSnapshot, None (Optional)
+        Snapshot whose arrays are reused
+
+    Returns
+    -------
+    MeshSnapshot
+        `out` if given, otherwise a new snapshot
+
+    Raises
+    ------
+    ValueError
+        If an attribute is missing or of a type that can't be read
+    """
+    attrs = []
+    for name in attributes:
+        attr = mesh.attributes.get(name)
+        if attr is None:
+            raise ValueError(f"{name}: no such attribute")
+        if attr.data_type not in DATA_TYPES:
+            raise ValueError(f"{name}: unsupported data type {attr.data_type!r}")
+        attrs.append(attr)
+
+    num_verts = len(mesh.vertices)
+    if out is None:
+        out = MeshSnapshot(None)
+
+    out.co = _read(mesh.vertices, "co", (num_verts, 3), mesh_buffers.FLOAT, out.co)
+    out.normals = _read(mesh.vertices, "normal", (num_verts, 3), mesh_buffers.FLOAT, out.normals) if normals else None
+
+    values = {}
+    for attr in attrs:
+        width, prop, kind = DATA_TYPES[attr.data_type]
+        values[attr.name] = _read(attr.data, prop, (len(attr.data), width), _DTYPES[kind], out.attributes.get(attr.name))
+    out.attributes = values
+    return out
+
+
+def changed_vertices(old: np.ndarray, new: np.ndarray, tolerance: float = 0.0) -> np.ndarray:
+    """Indices of the vertices that moved more than `tolerance` along any axis
+
+    Parameters
+    ----------
+    old : np.ndarray
+        Coordinates shaped (n, 3) or flat, e.g. `MeshSnapshot.co`
+    new : np.ndarray
+        Coordinates of the same vertices
+
+    Returns
+    -------
+    np.ndarray
+        Sorted int64 vertex indices
+    """
+    old = mesh_buffers.as_float(old, "diff_old")
+    new = mesh_buffers.as_float(new, "diff_new")
+    if len(old) != len(new):
+        raise ValueError(f"Can't compare {len(old)//3} vertices to {len(new)//3}")
+    # Every step writes into a reused buffer, no temporary the size of the mesh
+    num_verts = len(old) // 3
+    diff = mesh_buffers.float_buffer(len(old), "diff")
+    np.subtract(new, old, out=diff)
+    np.abs(diff, out=diff)
+    moved = mesh_buffers.float_buffer(num_verts, "diff_max")
+    np.max(diff.reshape(-1, 3), axis=1, out=moved)
+    mask = mesh_buffers.bool_buffer(num_verts, "diff_mask")
+    np.greater(moved, tolerance, out=mask)
+    return np.flatnonzero(mask)
+
+
+def set_if_changed(mesh: Mesh, coords: np.ndarray, current: MeshSnapshot, tolerance: float = 0.0) -> np.ndarray:
+    """Write `coords` into `mesh` only if some vertex moved more than `tolerance`
+
+    `current` must hold the mesh's coordinates, it is kept up to date
+
+    Returns
+    -------
+    np.ndarray
+        Indices of the vertices that moved, empty if nothing was written
+    """
+    changed = changed_vertices(current.co, coords, tolerance)
+    if len(changed):
+        set_py(mesh, coords)
+        np.copyto(current.co.reshape(-1), mesh_buffers.as_float(coords, "diff_new"))
+    return changed
+
+
+def snapshot_time(mesh: Mesh, repeat: int, number: int) -> None:
+    """Time `snapshot` against reading the coordinates in a Python loop"""
+    def python_loop():
+        return np.array([v.co[:] for v in mesh.vertices], dtype=mesh_buffers.FLOAT)
+
+    out = snapshot(mesh)
+    num_verts = len(mesh.vertices)
+    print("NUM OF VERTS:", num_verts)
+    for title, func in (
+            ("PYTHON LOOP", python_loop),
+            ("SNAPSHOT", lambda: snapshot(mesh, out=out)),
+            ("SNAPSHOT + NORMALS", lambda: snapshot(mesh, normals=True, out=out)),
+            ("CHANGED VERTICES", lambda: changed_vertices(out.co, out.co))):
+        benchmark.print_result(benchmark.run(title, func, (), "readback", num_verts, repeat, number))
+
+
+def check_snapshot(mesh: Mesh) -> bool:
+    """Check that moving a few vertices is seen by `changed_vertices` and `set_if_changed`"""
+    current = snapshot(mesh)
+    original = current.co.copy()
+    coords = current.co.copy()
+    moved = np.unique(np.random.randint(0, len(coords), max(1, len(coords) // 100)))
+    coords[moved] += 1.0
+
+    unchanged = len(set_if_changed(mesh, current.co.copy(), current)) == 0
+    changed = set_if_changed(mesh, coords, current)
+    written = np.array_equal(snapshot(mesh).co, coords)
+    # Moves under the tolerance are ignored
+    nudged = coords + 1e-4
+    ignored = len(changed_vertices(coords, nudged, tolerance=1e-3)) == 0
+
+    set_py(mesh, original)
+    return unchanged and np.array_equal(changed, moved) and written and ignored
+
+
+if __name__ == "__main__":
+    # Change These
+    runs = 3
+    loops = 10
+
+    me: Mesh = bpy.context.object.data
+
+    print(" STARTING ".center(60, "-"))
+    print("SNAPSHOT DIFF MATCHES:", check_snapshot(me))
+    snapshot_time(me, runs, loops)
+    print(" FINISHED ".center(60, "-"))
@@ -0,0 +1,273 @@
+from typing import NamedTuple, Tuple
+import numpy as np
+from mesh_buffers import FLOAT, INT
+
+
+class Primitive(NamedTuple):
+    """Geometry arrays ready for `mesh_builder.from_numpy`"""
+    vertices: np.ndarray
+    """float32 vertex coordinates shaped (n, 3)"""
+    faces: np.ndarray
+    """1D int32 array of every face's vertex indices"""
+    face_lengths: np.ndarray
+    """1D int32 array of each face's vertex count"""
+    uvs: np.ndarray
+    """float32 UV coordinates of every loop shaped (len(faces), 2)"""
+
+
+def _wrapped_quads(rows: int, cols: int, wrap_rows: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """Quads between `rows` rings of `cols` vertices, the rings wrap around
+
+    Vertex (row, col) has index row*cols + col. Looking at the quads with rows
+    going up and columns going right they are counter-clockwise.
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        int32 faces shaped (n, 4) and the (row, col) of every corner shaped
+        (n, 4, 2), not wrapped so they can be turned into seamless UVs
+    """
+    quad_rows = rows if wrap_rows else rows - 1
+    corners = np.empty([quad_rows, cols, 4, 2], dtype=INT)
+    r = np.arange(quad_rows, dtype=INT)[:, None]
+    c = np.arange(cols, dtype=INT)
+    corners[:, :, 0] = np.stack(np.broadcast_arrays(r, c), axis=-1)
+    corners[:, :, 1] = np.stack(np.broadcast_arrays(r, c + 1), axis=-1)
+    corners[:, :, 2] = np.stack(np.broadcast_arrays(r + 1, c + 1), axis=-1)
+    corners[:, :, 3] = np.stack(np.broadcast_arrays(r + 1, c), axis=-1)
+    corners = corners.reshape(-1, 4, 2)
+
+    faces = (corners[..., 0] % rows) * cols + corners[..., 1] % cols
+    return (faces.astype(INT), corners)
+
+
+def _ring(segments: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Cosine and sine of `segments` angles going counter-clockwise from +X"""
+    angles = np.linspace(0, 2*np.pi, segments, endpoint=False)
+    return (np.cos(angles), np.sin(angles))
+
+
+def _primitive(vertices: np.ndarray, faces: np.ndarray, face_lengths: np.ndarray, uvs: np.ndarray) -> Primitive:
+    return Primitive(
+        np.ascontiguousarray(vertices, dtype=FLOAT).reshape(-1, 3),
+        np.ascontiguousarray(faces, dtype=INT).ravel(),
+        np.ascontiguousarray(face_lengths, dtype=INT),
+        np.ascontiguousarray(uvs, dtype=FLOAT).reshape(-1, 2),
+    )
+
+
+def cube(size: float = 1.0) -> Primitive:
+    """Generate a cube centered on the origin, like bmesh.ops.create_cube
+
+    Every face is mapped to the whole UV square
+
+    Parameters
+    ----------
+    size : float
+        Length of the cube's edges
+    """
+    vertices = np.array([
+        (-1, -1, -1), (1, -1, -1), (1, 1, -1), (-1, 1, -1),
+        (-1, -1, 1), (1, -1, 1), (1, 1, 1), (-1, 1, 1),
+    ], dtype=FLOAT) * (size / 2)
+
+    faces = np.array([
+        0, 3, 2, 1,  # -Z
+        4, 5, 6, 7,  # +Z
+        0, 1, 5, 4,  # -Y
+        1, 2, 6, 5,  # +X
+        2, 3, 7, 6,  # +Y
+        3, 0, 4, 7,  # -X
+    ], dtype=INT)
+    face_lengths = np.full(6, 4, dtype=INT)
+    uvs = np.tile(np.array([(0, 0), (1, 0), (1, 1), (0, 1)], dtype=FLOAT), (6, 1))
+    return _primitive(vertices, faces, face_lengths, uvs)
+
+
+def cylinder(segments: int = 32, radius: float = 1.0, depth: float = 2.0, cap_ends: bool = True) -> Primitive:
+    """Generate a cylinder along Z centered on the origin, like bmesh.ops.create_cone
+
+    The sides fill the bottom half of the UV square, the caps are n-gons
+    side by side in the top half
+
+    Parameters
+    ----------
+    segments : int
+        Number of vertices around
+    radius : float
+    depth : float
+        Height along Z
+    cap_ends : bool
+        Fill the ends with an n-gon each
+    """
+    cos, sin = _ring(segments)
+    vertices = np.empty([2, segments, 3])
+    vertices[:, :, 0] = cos * radius
+    vertices[:, :, 1] = sin * radius
+    vertices[:, :, 2] = np.array([-depth/2, depth/2])[:, None]
+
+    sides, corners = _wrapped_quads(2, segments)
+    side_uvs = np.empty(corners.shape)
+    side_uvs[..., 0] = corners[..., 1] / segments
+    side_uvs[..., 1] = corners[..., 0] * 0.5
+
+    faces = [sides.ravel()]
+    face_lengths = [np.full(segments, 4)]
+    uvs = [side_uvs.reshape(-1, 2)]
+    if cap_ends:
+        bottom = np.arange(segments)[::-1]
+        top = np.arange(segments, segments*2)
+        faces += [bottom, top]
+        face_lengths.append([segments, segments])
+        for cap, center in ((bottom, 0.25), (top, 0.75)):
+            index = cap % segments
+            uvs.append(np.stack((center + cos[index]*0.25, 0.75 + sin[index]*0.25), axis=-1))
+    return _primitive(vertices, np.concatenate(faces), np.concatenate(face_lengths), np.concatenate(uvs))
+
+
+def uv_sphere(segments: int = 32, rings: int = 16, radius: float = 1.0) -> Primitive:
+    """Generate a UV sphere centered on the origin, like bmesh.ops.create_uvsphere
+
+    Parameters
+    ----------
+    segments : int
+        Number of vertices around
+    rings : int
+        Number of face rings from pole to pole
+    radius : float
+    """
+    cos, sin = _ring(segments)
+    # Vertex rings from the bottom up, without the poles
+    polar = np.linspace(-np.pi/2, np.pi/2, rings + 1)[1:-1]
+    ring_radius = np.cos(polar)[:, None]
+
+    vertices = np.empty([(rings - 1)*segments + 2, 3])
+    body = vertices[1:-1].reshape(rings - 1, segments, 3)
+    body[:, :, 0] = ring_radius * cos
+    body[:, :, 1] = ring_radius * sin
+    body[:, :, 2] = np.sin(polar)[:, None]
+    vertices[0] = (0, 0, -1)
+    vertices[-1] = (0, 0, 1)
+    vertices *= radius
+
+    # Quads between the rings, shifted past the bottom pole
+    quads, corners = _wrapped_quads(rings - 1, segments)
+    quads += 1
+    quad_uvs = np.empty(corners.shape)
+    quad_uvs[..., 0] = corners[..., 1] / segments
+    quad_uvs[..., 1] = (corners[..., 0] + 1) / rings
+
+    # Triangle fans around the poles
+    c = np.arange(segments)
+    c1 = (c + 1) % segments
+    bottom_pole, top_pole = 0, len(vertices) - 1
+    top_start = 1 + (rings - 2)*segments
+    bottom = np.stack((np.full(segments, bottom_pole), c1 + 1, c + 1), axis=-1)
+    top = np.stack((c + top_start, c1 + top_start, np.full(segments, top_pole)), axis=-1)
+
+    # Poles get the middle of their face's U range
+    u = c / segments
+    du = 1 / segments
+    bottom_uvs = np.stack((
+        np.stack((u + du/2, np.zeros(segments)), axis=-1),
+        np.stack((u + du, np.full(segments, 1/rings)), axis=-1),
+        np.stack((u, np.full(segments, 1/rings)), axis=-1),
+    ), axis=1)
+    top_uvs = np.stack((
+        np.stack((u, np.full(segments, 1 - 1/rings)), axis=-1),
+        np.stack((u + du, np.full(segments, 1 - 1/rings)), axis=-1),
+        np.stack((u + du/2, np.ones(segments)), axis=-1),
+    ), axis=1)
+
+    faces = np.concatenate((bottom.ravel(), quads.ravel(), top.ravel()))
+    face_lengths = np.concatenate((np.full(segments, 3), np.full(len(quads), 4), np.full(segments, 3)))
+    uvs = np.concatenate((bottom_uvs.reshape(-1, 2), quad_uvs.reshape(-1, 2), top_uvs.reshape(-1, 2)))
+    return _primitive(vertices, faces, face_lengths, uvs)
+
+
+def ico_sphere(subdivisions: int = 2, radius: float = 1.0) -> Primitive:
+    """Generate an ico sphere centered on the origin, like bmesh.ops.create_icosphere
+
+    `subdivisions` counts like Blender's, 1 is the plain icosahedron. UVs are
+    a spherical projection with the seam facing -X
+
+    Parameters
+    ----------
+    subdivisions : int
+    radius : float
+    """
+    t = (1 + 5 ** 0.5) / 2
+    vertices = np.array([
+        (-1, t, 0), (1, t, 0), (-1, -t, 0), (1, -t, 0),
+        (0, -1, t), (0, 1, t), (0, -1, -t), (0, 1, -t),
+        (t, 0, -1), (t, 0, 1), (-t, 0, -1), (-t, 0, 1),
+    ], dtype=float)
+    faces = np.array([
+        (0, 11, 5), (0, 5, 1), (0, 1, 7), (0, 7, 10), (0, 10, 11),
+        (1, 5, 9), (5, 11, 4), (11, 10, 2), (10, 7, 6), (7, 1, 8),
+        (3, 9, 4), (3, 4, 2), (3, 2, 6), (3, 6, 8), (3, 8, 9),
+        (4, 9, 5), (2, 4, 11), (6, 2, 10), (8, 6, 7), (9, 8, 1),
+    ])
+    vertices /= np.linalg.norm(vertices, axis=1)[:, None]
+
+    for _ in range(subdivisions - 1):
+        # One new vertex in the middle of every edge, shared by both faces
+        edges = np.sort(faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1)
+        unique, inverse = np.unique(edges, axis=0, return_inverse=True)
+        middle = vertices[unique].sum(axis=1)
+        middle /= np.linalg.norm(middle, axis=1)[:, None]
+
+        ab, bc, ca = (inverse.reshape(-1, 3) + len(vertices)).T
+        a, b, c = faces.T
+        faces = np.stack((
+            np.stack((a, ab, ca), axis=-1),
+            np.stack((ab, b, bc), axis=-1),
+            np.stack((ca, bc, c), axis=-1),
+            np.stack((ab, bc, ca), axis=-1),
+        ), axis=1).reshape(-1, 3)
+        vertices = np.concatenate((vertices, middle))
+
+    corners = vertices[faces]
+    u = np.arctan2(corners[..., 1], corners[..., 0]) / (2*np.pi) + 0.5
+    v = np.arcsin(np.clip(corners[..., 2], -1, 1)) / np.pi + 0.5
+    # Faces crossing the seam would stretch over the whole texture
+    seam = u.max(axis=1, keepdims=True) - u > 0.5
+    u[seam] += 1
+    # Corners on a pole take the middle of the face's other corners
+    pole = np.abs(corners[..., 2]) > 1 - 1e-9
+    for face, corner in zip(*np.nonzero(pole)):
+        u[face, corner] = np.delete(u[face], corner).mean()
+
+    uvs = np.stack((u, v), axis=-1)
+    return _primitive(vertices * radius, faces, np.full(len(faces), 3), uvs)
+
+
+def torus(major_segments: int = 48, minor_segments: int = 12, major_radius: float = 1.0, minor_radius: float = 0.25) -> Primitive:
+    """Generate a torus around Z centered on the origin, like bpy.ops.mesh.primitive_torus_add
+
+    Parameters
+    ----------
+    major_segments : int
+        Number of vertices around Z
+    minor_segments : int
+        Number of vertices around the tube
+    major_radius : float
+        Distance from the origin to the middle of the tube
+    minor_radius : float
+        Radius of the tube
+    """
+    major_cos, major_sin = _ring(major_segments)
+    minor_cos, minor_sin = _ring(minor_segments)
+
+    # One ring around Z for every step around the tube
+    distance = major_radius + minor_radius * minor_cos[:, None]
+    vertices = np.empty([minor_segments, major_segments, 3])
+    vertices[:, :, 0] = distance * major_cos
+    vertices[:, :, 1] = distance * major_sin
+    vertices[:, :, 2] = (minor_radius * minor_sin)[:, None]
+
+    faces, corners = _wrapped_quads(minor_segments, major_segments, wrap_rows=True)
+    uvs = np.empty(corners.shape)
+    uvs[..., 0] = corners[..., 1] / major_segments
+    uvs[..., 1] = corners[..., 0] / minor_segments
+    return _primitive(vertices, faces, np.full(len(faces), 4), uvs)
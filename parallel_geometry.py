@@ -0,0 +1,193 @@
+"""Compute mesh arrays in worker processes, hand them over through shared memory
+
+Nothing here imports bpy at module level, worker processes run a plain Python
+interpreter. Run it from a saved .py file, spawned workers have to be able to
+import it.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from timeit import default_timer as dt
+import traceback
+from typing import Callable, Dict, List, Sequence, Tuple
+import numpy as np
+from mesh_buffers import FLOAT, INT
+from grid_topology import grid_faces, grid_vertices
+
+# name -> (shape, dtype)
+Layout = Dict[str, Tuple[Tuple[int, ...], type]]
+# (function, args, layout), the function is called as func(*args, **arrays)
+Job = Tuple[Callable, tuple, Layout]
+
+
+class SharedArrays:
+    """Numpy arrays backed by shared memory blocks
+
+    Created in the main process, filled by a worker, read by the main process
+    and released with `close`.
+    """
+
+    def __init__(self, layout: Layout) -> None:
+        self.layout = layout
+        self.blocks: Dict[str, shared_memory.SharedMemory] = {}
+        self.arrays: Dict[str, np.ndarray] = {}
+        for name, (shape, dtype) in layout.items():
+            size = max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+            block = shared_memory.SharedMemory(create=True, size=size)
+            self.blocks[name] = block
+            self.arrays[name] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+    @property
+    def handles(self) -> Dict[str, Tuple[str, Tuple[int, ...], type]]:
+        """Picklable description of the blocks for `attach`"""
+        return {name: (self.blocks[name].name, shape, dtype) for name, (shape, dtype) in self.layout.items()}
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.arrays[name]
+
+    def close(self) -> None:
+        """Drop the arrays and free the shared memory"""
+        self.arrays.clear()
+        for block in self.blocks.values():
+            block.close()
+            block.unlink()
+        self.blocks.clear()
+
+
+def _run_job(func: Callable, args: tuple, handles: Dict[str, Tuple[str, Tuple[int, ...], type]]) -> None:
+    """Worker side, attach to the shared blocks and let `func` fill them"""
+    blocks = [shared_memory.SharedMemory(name=block_name) for block_name, _, _ in handles.values()]
+    arrays = None
+    try:
+        arrays = {
+            name: np.ndarray(shape, dtype=dtype, buffer=block.buf)
+            for (name, (_, shape, dtype)), block in zip(handles.items(), blocks)
+        }
+        func(*args, **arrays)
+    except BaseException as error:
+        # The traceback keeps func's frame and its views alive, closing would then fail
+        traceback.clear_frames(error.__traceback__)
+        raise
+    finally:
+        # Views still holding `block.buf` make `close` raise a BufferError
+        arrays = None
+        for block in blocks:
+            block.close()
+
+
+def compute(jobs: Sequence[Job], workers: int = None) -> List[SharedArrays]:
+    """Run `jobs` in a process pool
+
+    Parameters
+    ----------
+    jobs : Sequence[Job]
+        (function, args, layout) tuples. The function must be importable by
+        the workers and write its results into the arrays it gets as keywords
+    workers : int, None (Optional)
+        Number of processes, defaults to the number of cores. 0 runs every
+        job in this process
+
+    Returns
+    -------
+    List[SharedArrays]
+        The filled arrays of each job, to be released with `close`
+    """
+    results = [SharedArrays(layout) for _, _, layout in jobs]
+    try:
+        if workers == 0:
+            for (func, args, _), shared in zip(jobs, results):
+                func(*args, **shared.arrays)
+        else:
+            with ProcessPoolExecutor(workers) as pool:
+                futures = [
+                    pool.submit(_run_job, func, args, shared.handles)
+                    for (func, args, _), shared in zip(jobs, results)
+                ]
+                for future in futures:
+                    future.result()
+    except BaseException:
+        for shared in results:
+            shared.close()
+        raise
+    return results
+
+
+def fill_grid(x: int, y: int, vertices: np.ndarray, faces: np.ndarray, face_lengths: np.ndarray) -> None:
+    """Write a x*y grid into preallocated arrays"""
+    grid_vertices(x, y, vertices)
+    grid_faces(x, y, faces)
+    face_lengths[:] = 4
+
+
+def grid_job(x: int, y: int) -> Job:
+    """Job computing the geometry of a x*y grid"""
+    faces_len = (x-1)*(y-1)
+    return (fill_grid, (x, y), {
+        "vertices": ((x*y*3,), FLOAT),
+        "faces": ((faces_len*4,), INT),
+        "face_lengths": ((faces_len,), INT),
+    })
+
+
+def fill_wave(num_verts: int, phase: float, coords: np.ndarray) -> None:
+    """Write a sine wave displaced copy of a grid's vertices into `coords`"""
+    side = int(num_verts ** 0.5)
+    verts = coords.reshape(-1, 3)
+    verts[:, 0] = np.arange(num_verts) % side / side
+    verts[:, 1] = np.arange(num_verts) // side / side
+    np.sin(verts[:, 0] * 10 + phase, out=verts[:, 2])
+
+
+def wave_job(num_verts: int, phase: float) -> Job:
+    """Job computing coordinates for `set_py`"""
+    return (fill_wave, (num_verts, phase), {"coords": ((num_verts*3,), FLOAT)})
+
+
+def upload(mesh: 'Mesh', shared: SharedArrays) -> None:
+    """Write a job's results into `mesh`, the only part running on the main thread
+
+    Arrays named vertices/faces/face_lengths replace the mesh's geometry, an
+    array named coords only sets the vertex coordinates.
+    """
+    if "coords" in shared.arrays:
+        mesh.vertices.foreach_set("co", shared["coords"])
+        mesh.update()
+        return
+    # Imported here so the workers never import bpy
+    from mesh_builder import from_numpy
+    from_numpy(mesh, shared["vertices"], shared["faces"], shared["face_lengths"])
+
+
+def parallel_time(x: int, y: int, num_meshes: int, worker_counts=(0, 1, 2, 4, 8)) -> None:
+    """Print how computing `num_meshes` x*y grids scales with the number of workers"""
+    import bpy
+
+    jobs = [grid_job(x, y) for _ in range(num_meshes)]
+    print("NUM OF MESHES:", num_meshes, "| NUM OF VERTS:", x*y)
+    for workers in worker_counts:
+        st = dt()
+        results = compute(jobs, workers)
+        compute_time = dt() - st
+
+        st = dt()
+        meshes = []
+        for shared in results:
+            me = bpy.data.meshes.new("parallel")
+            upload(me, shared)
+            shared.close()
+            meshes.append(me)
+        upload_time = dt() - st
+        bpy.data.batch_remove(meshes)
+
+        title = "IN PROCESS" if workers == 0 else f"{workers} WORKERS"
+        print(f'{title}: {round(compute_time, 3)} s compute + {round(upload_time, 3)} s upload')
+
+
+if __name__ == "__main__":
+    # Change These
+    x = 500
+    y = 500
+    num_meshes = 64
+
+    print(" STARTING ".center(60, "-"))
+    parallel_time(x, y, num_meshes)
+    print(" FINISHED ".center(60, "-"))
@@ -2,107 +2,289 @@ import bpy
 import bmesh
 from bpy.types import GeometryNodeGroup, Object, Mesh, NodesModifier
 import numpy as np
-import timeit
+from functools import partial
+from grid_topology import GridTopology, grid_faces, grid_topology, grid_vertices
+import mesh_buffers
+import numpy_primitives
+from mesh_builder import from_numpy
+import benchmark
+import tracing
 
-print(" STARTING ".center(60, "-"))
 
+@benchmark.grid_method("BPY OPS")
+def bpy_ops(x: int, y: int):
+    """Generate a grid object using bpy ops, the object is removed again"""
+    bpy.ops.mesh.primitive_grid_add(x_subdivisions=x, y_subdivisions=y)
+    bpy.data.objects.remove(bpy.context.object)
 
+
+@benchmark.grid_method("BMESH OPS")
+@tracing.traced("bmesh_op")
 def bmesh_op(x: int, y: int):
     """Generate a grid object using bmesh ops"""
     me: Mesh = bpy.context.object.data
 
-    bm = bmesh.new()
-    bmesh.ops.create_grid(
-        bm,
-        x_segments=x,
-        y_segments=y,
-        size=2.0
-    )
-    bm.to_mesh(me)
-    me.update()
-
-
-def bpy_py(x: int, y: int):
-    """Generate a grid object using mesh ops"""
-    def from_mydata(mesh: Mesh, vertices: np.ndarray, faces: np.ndarray, faces_len:int) -> None:
+    with tracing.span("create grid"):
+        bm = bmesh.new()
+        bmesh.ops.create_grid(
+            bm,
+            x_segments=x,
+            y_segments=y,
+            size=2.0
+        )
+    with tracing.span("to mesh"):
+        bm.to_mesh(me)
+        me.update()
+
+
+@benchmark.grid_method("FROM NumPYDATA")
+@tracing.traced("bpy_py")
+def bpy_py(x: int, y: int, analytic_edges: bool = False):
+    """Generate a grid object using mesh ops
+
+    If `analytic_edges` is True the grid's edges are written directly instead
+    of letting Blender derive them with `mesh.update(calc_edges=True)`
+    """
+    def from_mydata(mesh: Mesh, vertices: np.ndarray, topology: GridTopology, analytic_edges: bool) -> None:
         """Like Blender's mesh.from_pydata but optimized for numpy and grid creation
 
         Parameters
         ----------
         mesh : Mesh
         vertices : np.ndarray
-            1D numpy array of vertex coordinates. Length of list should be x*y*3
-        faces : np.ndarray
-            1D numpy array of each face's vertex indices. Length should be (y-1)*(x-1)*4
-        faces_len : int
-            The number of faces
+            1D float32 array of vertex coordinates. Length of list should be x*y*3
+        topology : GridTopology
+            The cached faces, loop starts, loop totals and edges of the grid
+        analytic_edges : bool
+            Write the topology's edges instead of calculating them
         """
         mesh.clear_geometry()
 
-        face_lengths = np.full(faces_len, 4)  # Assume we have 4 verts per face
-
+        faces_len = len(topology.loop_total)
         vertices_len = int(len(vertices)/3)
 
         mesh.vertices.add(vertices_len)
-        mesh.loops.add(len(faces))
+        mesh.loops.add(len(topology.faces))
         mesh.polygons.add(faces_len)
 
         mesh.vertices.foreach_set("co", vertices)
 
-        vertex_indices = faces.copy()
-        # Can assume each face has only 4 verts
-        loop_starts = np.arange(faces_len)*4
+        mesh.polygons.foreach_set("loop_total", topology.loop_total)
+        mesh.polygons.foreach_set("loop_start", topology.loop_start)
+        mesh.polygons.foreach_set("vertices", topology.faces)
 
-        mesh.polygons.foreach_set("loop_total", face_lengths)
-        mesh.polygons.foreach_set("loop_start", loop_starts)
-        mesh.polygons.foreach_set("vertices", vertex_indices)
-
-        if faces_len:
+        if analytic_edges:
+            mesh.edges.add(int(len(topology.edges)/2))
+            mesh.edges.foreach_set("vertices", topology.edges)
+            mesh.loops.foreach_set("edge_index", topology.loop_edges)
+        elif faces_len:
             mesh.update(
                 calc_edges=True
             )
 
     me: Mesh = bpy.context.object.data
 
-    # VERTS
-    verts = np.zeros([y, x, 3], dtype=float)
-    xc = np.linspace(0, 1, x)
-    yc = np.linspace(0, 1, y)
-    xv, yv = np.meshgrid(xc, yc)
-    verts[:, :, 0] = xv
-    verts[:, :, 1] = yv
-
-    # FACES
-    a = np.arange(x-1, dtype=int)
-    b = a + 1
-    c = a + x
-    d = c + 1
-    faces = np.empty([y-1, x-1, 4], dtype=int)
-    faces[:, :, 0] = a
-    faces[:, :, 1] = b
-    faces[:, :, 2] = d
-    faces[:, :, 3] = c
-    # print("Faces Pre:\n",faces)
-
-    fc = np.arange(faces.shape[0])
-    # Make array of same shape with numbers to add
-    # array([1,2,3]) becomes array([1,1,1],[2,2,2],[3,3,3]) or whatever the shape of faces is
-    broad_fc = np.broadcast_to(fc, faces.T.shape).T
-    # print("broad_fc:\n",broad_fc)
-    # print(f"broad_fc*{x}:\n",broad_fc*x)
-    faces += broad_fc*x
-    faces.resize([(y-1)*(x-1), 4])
-
-    from_mydata(
-        me,    # mesh
-        verts.flatten(),  # verts
-        faces.flatten(),  # faces
-        len(faces),
-    )
+    # VERTS - written straight into a reused float32 buffer
+    with tracing.span("vertices"):
+        verts = grid_vertices(x, y, mesh_buffers.float_buffer(x*y*3, "grid_co"))
+
+    # FACES - identical for every grid of the same resolution
+    with tracing.span("topology"):
+        topology = grid_topology(x, y)
+
+    with tracing.span("from_mydata"):
+        from_mydata(
+            me,    # mesh
+            verts.ravel(),  # verts
+            topology,
+            analytic_edges,
+        )
+
+        me.update()
+
+
+benchmark.grid_method("FROM NumPYDATA (ANALYTIC EDGES)")(partial(bpy_py, analytic_edges=True))
+
+
+# Rows generated per band by bpy_py_chunked
+BAND_ROWS = 256
+
+
+@benchmark.grid_method("FROM NumPYDATA (CHUNKED)")
+@tracing.traced("bpy_py_chunked")
+def bpy_py_chunked(x: int, y: int, band_rows: int = BAND_ROWS):
+    """Generate the same grid as `bpy_py` with analytic edges, in bounded memory
+
+    `foreach_set` can't write at an offset, so every attribute is still passed
+    whole. Instead of building every array up front, a single upload buffer
+    sized for the largest attribute is reused as float32 or int32 for each
+    attribute in turn. It is filled band by band, each band being one scratch
+    band plus an offset. Nothing is cached, so the extra memory is the upload
+    buffer and one band no matter how many attributes a grid has.
+
+    Parameters
+    ----------
+    x : int
+    y : int
+    band_rows : int
+        Number of rows generated at once
+    """
+    me: Mesh = bpy.context.object.data
+    INT = mesh_buffers.INT
+
+    num_verts = x*y
+    num_faces = (y-1)*(x-1)
+    num_horizontal = y*(x-1)
+    num_edges = num_horizontal + (y-1)*x
+    band_rows = max(1, min(band_rows, y))
+
+    upload = np.empty(max(num_verts*3, num_faces*4, num_edges*2), dtype=INT)
+    scratch = np.empty(band_rows*x*4, dtype=INT)
+    # Index of the first vertex of each row in a band
+    band_starts = (np.arange(band_rows, dtype=INT) * x)[:, None]
+
+    def fill(out: np.ndarray, rows: int, per_row: int, template: np.ndarray, offset, width: int = 1) -> np.ndarray:
+        """Write `rows` rows of `per_row` values into `out`, band by band
+
+        Each band is `template` plus `offset(first_row)`, a scalar or an array
+        of `width` values repeating along the band
+        """
+        for r0 in range(0, rows, band_rows):
+            r1 = min(r0 + band_rows, rows)
+            n = (r1 - r0) * per_row
+            np.add(
+                template[:n].reshape(-1, width),
+                offset(r0),
+                out=out[r0*per_row:r1*per_row].reshape(-1, width),
+            )
+        return out[:rows*per_row]
+
+    with tracing.span("allocate"):
+        me.clear_geometry()
+        me.vertices.add(num_verts)
+        me.loops.add(num_faces*4)
+        me.polygons.add(num_faces)
+        me.edges.add(num_edges)
+
+    with tracing.span("vertices"):
+        co = upload.view(mesh_buffers.FLOAT)
+        xs = np.linspace(0, 1, x, dtype=mesh_buffers.FLOAT)
+        ys = np.linspace(0, 1, y, dtype=mesh_buffers.FLOAT)
+        for r0 in range(0, y, band_rows):
+            r1 = min(r0 + band_rows, y)
+            verts = co[r0*x*3:r1*x*3].reshape(r1 - r0, x, 3)
+            verts[:, :, 0] = xs
+            verts[:, :, 1] = ys[r0:r1, None]
+            verts[:, :, 2] = 0.0
+        me.vertices.foreach_set("co", co[:num_verts*3])
+
+    with tracing.span("polygons"):
+        upload[:num_faces] = 4
+        me.polygons.foreach_set("loop_total", upload[:num_faces])
+
+        np.multiply(np.arange(band_rows*(x-1), dtype=INT), 4, out=scratch[:band_rows*(x-1)])
+        me.polygons.foreach_set("loop_start", fill(upload, y-1, x-1, scratch, lambda r0: r0*(x-1)*4))
+
+        grid_faces(x, band_rows+1, out=scratch[:band_rows*(x-1)*4])
+        me.polygons.foreach_set("vertices", fill(upload, y-1, (x-1)*4, scratch, lambda r0: r0*x))
+
+    with tracing.span("edges"):
+        # Same order as grid_edges, horizontal edges first
+        horizontal = scratch[:band_rows*(x-1)*2].reshape(band_rows, x-1, 2)
+        horizontal[:, :, 0] = band_starts + np.arange(x-1, dtype=INT)
+        horizontal[:, :, 1] = horizontal[:, :, 0] + 1
+        fill(upload, y, (x-1)*2, scratch, lambda r0: r0*x)
+
+        vertical = scratch[:band_rows*x*2].reshape(band_rows, x, 2)
+        vertical[:, :, 0] = band_starts + np.arange(x, dtype=INT)
+        vertical[:, :, 1] = vertical[:, :, 0] + x
+        fill(upload[num_horizontal*2:], y-1, x*2, scratch, lambda r0: r0*x)
+        me.edges.foreach_set("vertices", upload[:num_edges*2])
+
+        # Same order as grid_loop_edges, horizontal and vertical edge indices alternate
+        loop_edges = scratch[:band_rows*(x-1)*4].reshape(band_rows, x-1, 4)
+        h = np.arange(band_rows, dtype=INT)[:, None] * (x-1) + np.arange(x-1, dtype=INT)
+        v = band_starts + np.arange(x-1, dtype=INT)
+        loop_edges[:, :, 0] = h             # a -> b
+        loop_edges[:, :, 1] = v + 1         # b -> d
+        loop_edges[:, :, 2] = h + (x-1)     # d -> c
+        loop_edges[:, :, 3] = v             # c -> a
+        me.loops.foreach_set("edge_index", fill(
+            upload, y-1, (x-1)*4, scratch,
+            lambda r0: np.array([r0*(x-1), num_horizontal + r0*x]*2, dtype=INT),
+            width=4,
+        ))
 
     me.update()
 
 
+def check_chunked_grid(x: int, y: int, band_rows: int = 7) -> bool:
+    """Check that `bpy_py_chunked` builds the same mesh as `bpy_py` with analytic edges
+
+    Both grids are generated in the active object's mesh, the small default
+    `band_rows` makes sure several bands and a partial last band are written
+
+    Returns
+    -------
+    bool
+        True if coordinates, polygons, edges and loop edges are identical
+    """
+    def mesh_arrays(mesh: Mesh) -> list:
+        arrays = []
+        for seq, attr, size, dtype in (
+                (mesh.vertices, "co", len(mesh.vertices)*3, mesh_buffers.FLOAT),
+                (mesh.polygons, "loop_start", len(mesh.polygons), mesh_buffers.INT),
+                (mesh.polygons, "loop_total", len(mesh.polygons), mesh_buffers.INT),
+                (mesh.polygons, "vertices", len(mesh.loops), mesh_buffers.INT),
+                (mesh.edges, "vertices", len(mesh.edges)*2, mesh_buffers.INT),
+                (mesh.loops, "edge_index", len(mesh.loops), mesh_buffers.INT)):
+            array = np.empty(size, dtype=dtype)
+            seq.foreach_get(attr, array)
+            arrays.append(array)
+        return arrays
+
+    me: Mesh = bpy.context.object.data
+
+    bpy_py(x, y, analytic_edges=True)
+    expected = mesh_arrays(me)
+
+    bpy_py_chunked(x, y, band_rows)
+    result = mesh_arrays(me)
+
+    same = all(np.array_equal(a, b) for a, b in zip(expected, result))
+    # validate() returns True when it had to correct something
+    return same and not me.validate()
+
+
+def check_grid_edges(x: int, y: int) -> bool:
+    """Check that `bpy_py` with analytic edges matches Blender's calc_edges
+
+    Both grids are generated in the active object's mesh
+
+    Returns
+    -------
+    bool
+        True if both meshes have the same set of edges and valid loop edges
+    """
+    def edge_set(mesh: Mesh) -> set:
+        edges = np.empty(len(mesh.edges)*2, dtype=mesh_buffers.INT)
+        mesh.edges.foreach_get("vertices", edges)
+        return set(map(tuple, np.sort(edges.reshape(-1, 2), axis=1).tolist()))
+
+    me: Mesh = bpy.context.object.data
+
+    bpy_py(x, y)
+    expected = edge_set(me)
+
+    bpy_py(x, y, analytic_edges=True)
+    result = edge_set(me)
+
+    # validate() returns True when it had to correct something
+    return result == expected and not me.validate()
+
+
+@benchmark.grid_method("GEO NODE")
+@tracing.traced("geo_node")
 def geo_node(x: int, y: int):
     """Generate a grid object using geometry nodes"""
     def create_plane_gen_nodes(obj) -> GeometryNodeGroup:
@@ -122,79 +304,157 @@ def geo_node(x: int, y: int):
 
     obj: Object = bpy.context.object
 
-    mod: NodesModifier = obj.modifiers.new('Plane Generator', 'NODES')
+    with tracing.span("add modifier"):
+        mod: NodesModifier = obj.modifiers.new('Plane Generator', 'NODES')
 
-    # Creat Plane with Geo Nodes
-    ng = bpy.data.node_groups.get('Plane Generator')
-    if not ng:
-        ng = create_plane_gen_nodes(obj)
-    mod.node_group = ng
-    ng.nodes['Grid'].inputs['Vertices X'].default_value = x
-    ng.nodes['Grid'].inputs['Vertices Y'].default_value = y
+        # Creat Plane with Geo Nodes
+        ng = bpy.data.node_groups.get('Plane Generator')
+        if not ng:
+            ng = create_plane_gen_nodes(obj)
+        mod.node_group = ng
+        ng.nodes['Grid'].inputs['Vertices X'].default_value = x
+        ng.nodes['Grid'].inputs['Vertices Y'].default_value = y
 
     # Apply Modifier
-    dg = bpy.context.evaluated_depsgraph_get()
-    mesh = bpy.data.meshes.new_from_object(obj.evaluated_get(dg))
-    obj.modifiers.remove(mod)
-    obj.data = mesh
+    with tracing.span("depsgraph evaluate"):
+        dg = bpy.context.evaluated_depsgraph_get()
+        obj_eval = obj.evaluated_get(dg)
+    with tracing.span("apply"):
+        mesh = bpy.data.meshes.new_from_object(obj_eval)
+        obj.modifiers.remove(mod)
+        obj.data = mesh
 
     # Reset Node Group to not cause slow downs when assigning to a new object
     ng.nodes['Grid'].inputs['Vertices X'].default_value = 3
     ng.nodes['Grid'].inputs['Vertices Y'].default_value = 3
 
 
-def mytimeit(title, SETUP_CODE, TEST_CODE, repeat, number):
-    # timeit.repeat statement
-    times = timeit.repeat(setup=SETUP_CODE,
-                          stmt=TEST_CODE,
-                          repeat=repeat,
-                          number=number)
+# PRIMITIVES - x and y are the resolution, e.g. segments and rings of a UV sphere
 
-    # Print out Results
-    avg = sum(times)/len(times)
-    error_range = max(times) - avg
-    print(
-        f'{title}: {round(avg,2)} s ± {round(error_range,3)} s per loop')
-    print(f'    (mean ± std. dev. of {repeat} runs, {number} loops each)')
-    print(f'    (Min:{min(times)} | Max:{max(times)})')
+def add_numpy_primitive(primitive: numpy_primitives.Primitive) -> None:
+    """Write a NumPy primitive into the active object's mesh"""
+    from_numpy(bpy.context.object.data, **primitive._asdict())
 
 
-def bpy_ops_time(x, y, repeat, number):
-    """Time bpy ops grid creation"""
-    SETUP_CODE = "import bpy"
-    TEST_CODE = f'bpy.ops.mesh.primitive_grid_add(x_subdivisions={x},y_subdivisions={y},);bpy.data.objects.remove(bpy.data.objects["Grid"])'
+def add_bmesh_primitive(create, **kwargs) -> None:
+    """Run a bmesh.ops.create_* op with UVs into the active object's mesh"""
+    me: Mesh = bpy.context.object.data
+    bm = bmesh.new()
+    # calc_uvs writes into the active UV layer
+    bm.loops.layers.uv.new()
+    create(bm, calc_uvs=True, **kwargs)
+    bm.to_mesh(me)
+    bm.free()
+    me.update()
 
-    mytimeit("BPY OPS", SETUP_CODE, TEST_CODE, repeat, number)
 
+def remove_added_object() -> None:
+    """Remove the object, and its mesh, a bpy.ops primitive operator added"""
+    obj = bpy.context.object
+    me = obj.data
+    bpy.data.objects.remove(obj)
+    bpy.data.meshes.remove(me)
 
-def bmesh_ops_time(x, y, repeat, number):
-    """Time bmesh ops grid creation"""
-    SETUP_CODE = '''
-import bpy, bmesh
-from __main__ import bmesh_op'''
-    TEST_CODE = f'bmesh_op({x},{y})'
 
-    mytimeit("BMESH OPS", SETUP_CODE, TEST_CODE, repeat, number)
+def ico_subdivisions(x: int, y: int) -> int:
+    """Ico sphere subdivisions giving about x*y vertices"""
+    return 1 + max(0, round(np.log(x*y/10) / np.log(4)))
 
 
-def bpy_py_time(x, y, repeat, number):
-    """Time bpy mesh ops grid creation"""
-    SETUP_CODE = '''
-import bpy
-from __main__ import bpy_py'''
-    TEST_CODE = f'bpy_py({x},{y})'
+# Blender 3.0 renamed the bmesh create ops' diameters to what they always were
+IS_RADIUS = bpy.app.version >= (3, 0, 0)
+CONE_RADII = ("radius1", "radius2") if IS_RADIUS else ("diameter1", "diameter2")
+SPHERE_RADIUS = "radius" if IS_RADIUS else "diameter"
 
-    mytimeit("FROM NumPYDATA", SETUP_CODE, TEST_CODE, repeat, number)
 
+@benchmark.primitive_method("CUBE", "BPY OPS")
+def cube_bpy_ops(x: int, y: int):
+    bpy.ops.mesh.primitive_cube_add(size=2.0)
+    remove_added_object()
+
+
+@benchmark.primitive_method("CUBE", "BMESH OPS")
+def cube_bmesh_op(x: int, y: int):
+    add_bmesh_primitive(bmesh.ops.create_cube, size=2.0)
+
+
+@benchmark.primitive_method("CUBE", "NUMPY")
+def cube_numpy(x: int, y: int):
+    add_numpy_primitive(numpy_primitives.cube(2.0))
+
+
+@benchmark.primitive_method("CYLINDER", "BPY OPS")
+def cylinder_bpy_ops(x: int, y: int):
+    """x segments"""
+    bpy.ops.mesh.primitive_cylinder_add(vertices=x)
+    remove_added_object()
+
+
+@benchmark.primitive_method("CYLINDER", "BMESH OPS")
+def cylinder_bmesh_op(x: int, y: int):
+    """x segments"""
+    add_bmesh_primitive(
+        bmesh.ops.create_cone,
+        cap_ends=True,
+        segments=x,
+        depth=2.0,
+        **dict.fromkeys(CONE_RADII, 1.0),
+    )
+
+
+@benchmark.primitive_method("CYLINDER", "NUMPY")
+def cylinder_numpy(x: int, y: int):
+    """x segments"""
+    add_numpy_primitive(numpy_primitives.cylinder(x))
+
+
+@benchmark.primitive_method("UV SPHERE", "BPY OPS")
+def uv_sphere_bpy_ops(x: int, y: int):
+    """x segments, y rings"""
+    bpy.ops.mesh.primitive_uv_sphere_add(segments=x, ring_count=y)
+    remove_added_object()
+
+
+@benchmark.primitive_method("UV SPHERE", "BMESH OPS")
+def uv_sphere_bmesh_op(x: int, y: int):
+    """x segments, y rings"""
+    add_bmesh_primitive(bmesh.ops.create_uvsphere, u_segments=x, v_segments=y, **{SPHERE_RADIUS: 1.0})
+
+
+@benchmark.primitive_method("UV SPHERE", "NUMPY")
+def uv_sphere_numpy(x: int, y: int):
+    """x segments, y rings"""
+    add_numpy_primitive(numpy_primitives.uv_sphere(x, y))
 
-def geo_node_time(x, y, repeat, number):
-    """Time geo nodes grid creation"""
-    SETUP_CODE = '''
-import bpy
-from __main__ import geo_node'''
-    TEST_CODE = f'geo_node({x},{y})'
 
-    mytimeit("GEO NODE", SETUP_CODE, TEST_CODE, repeat, number)
+@benchmark.primitive_method("ICO SPHERE", "BPY OPS")
+def ico_sphere_bpy_ops(x: int, y: int):
+    bpy.ops.mesh.primitive_ico_sphere_add(subdivisions=ico_subdivisions(x, y))
+    remove_added_object()
+
+
+@benchmark.primitive_method("ICO SPHERE", "BMESH OPS")
+def ico_sphere_bmesh_op(x: int, y: int):
+    add_bmesh_primitive(bmesh.ops.create_icosphere, subdivisions=ico_subdivisions(x, y), **{SPHERE_RADIUS: 1.0})
+
+
+@benchmark.primitive_method("ICO SPHERE", "NUMPY")
+def ico_sphere_numpy(x: int, y: int):
+    add_numpy_primitive(numpy_primitives.ico_sphere(ico_subdivisions(x, y)))
+
+
+# There is no bmesh op for a torus
+@benchmark.primitive_method("TORUS", "BPY OPS")
+def torus_bpy_ops(x: int, y: int):
+    """x major segments, y minor segments"""
+    bpy.ops.mesh.primitive_torus_add(major_segments=x, minor_segments=y)
+    remove_added_object()
+
+
+@benchmark.primitive_method("TORUS", "NUMPY")
+def torus_numpy(x: int, y: int):
+    """x major segments, y minor segments"""
+    add_numpy_primitive(numpy_primitives.torus(x, y))
 
 
 if __name__ == "__main__":
@@ -203,17 +463,42 @@ if __name__ == "__main__":
     y = 100
     runs = 3
     loops = 100
-    
+    # Where to write the results, .json or .csv. Empty to skip
+    results_path = ""
+    # Run every method over a range of grid sizes instead of just x*y
+    sweep = False
+    sweep_loops = 3
+    # Where to write a Chrome trace of every run. Empty to skip
+    trace_path = ""
+    # Resolution of the primitives, e.g. segments and rings. 0 to skip them
+    primitive_x = 32
+    primitive_y = 16
+
     C = bpy.context
     obj = C.object
 
-    bpy_ops_time(x, y, runs, loops)
-    
-    C.view_layer.objects.active = obj
-    bmesh_ops_time(x, y, runs, loops)
-    
-    C.view_layer.objects.active = obj
-    bpy_py_time(x, y, runs, loops)
-    
-    C.view_layer.objects.active = obj
-    geo_node_time(x, y, runs, loops)
+    print(" STARTING ".center(60, "-"))
+    if trace_path:
+        tracing.enable(trace_path)
+
+    def restore_active():
+        C.view_layer.objects.active = obj
+
+    if sweep:
+        results = benchmark.sweep_grid_methods(benchmark.sweep_sides(), runs, sweep_loops, setup=restore_active)
+        benchmark.print_scaling(results)
+    else:
+        results = benchmark.run_grid_methods(x, y, runs, loops, setup=restore_active)
+    print(f'Topology cache: {grid_topology.cache_info()}')
+    if primitive_x:
+        results += benchmark.run_primitive_methods(primitive_x, primitive_y, runs, loops, setup=restore_active)
+
+    restore_active()
+    print("ANALYTIC EDGES MATCH CALC_EDGES:", check_grid_edges(x, y))
+    restore_active()
+    print("CHUNKED MATCHES ONE-SHOT:", check_chunked_grid(x, y))
+
+    if results_path:
+        benchmark.write_results(results, results_path)
+    if trace_path:
+        tracing.print_summary(tracing.disable())
@@ -1,6 +1,7 @@
 import bpy
-import bmesh
-import threading
+from bulk_objects import cube_mesh
+from job_runner import JobRunner
+import tracing
 
 class ModalTimerOperator(bpy.types.Operator):
     """Operator which runs itself from a timer"""
@@ -8,62 +9,62 @@ class ModalTimerOperator(bpy.types.Operator):
     bl_label = "Modal Timer Operator"
 
     _timer = None
-    
+    _runner: JobRunner = None
+
     total_cubes = 10_000
-    cubes_created = 0
-    updated=False
-    end_early = False
-    _th = None
-    
+    # Time spent creating cubes per timer event, the rest is left to the UI
+    budget_ms = 12.0
+    timer_interval = 1 / 60
+    # Where to write a Chrome trace of the run. Empty to skip
+    trace_path = ""
+
     def create_cubes(self):
-        while self.cubes_created < self.total_cubes:
-            me = bpy.data.meshes.new("test")
-            obj = bpy.data.objects.new("test", me)
-            bm = bmesh.new()
-            bmesh.ops.create_cube(bm, size=1.0)
-            bm.to_mesh(me)
-            self.cubes_created += 1
-            self.updated = True
-            if self.end_early:
-                print("Ending Early")
-                return
+        """Create one cube per iteration, meant to be run by a JobRunner"""
+        # Build the geometry once, every other cube gets a cheap copy
+        me = cube_mesh("test")
+        for i in range(self.total_cubes):
+            with tracing.span("create cube"):
+                obj = bpy.data.objects.new("test", me.copy() if i else me)
+            yield obj
 
     def modal(self, context, event):
         context.area.tag_redraw()
-        
+
         if event.type == 'ESC':
-            self.end_early = True
+            self._runner.cancel()
             self.finish(context)
             return {'CANCELLED'}
-        
-        if self.updated:
-            progress = self.cubes_created / self.total_cubes
-            self.text.progress_bar = int(round(progress * 100, 2))
-            self.updated = False
-        
-        if not self._th.is_alive():
-            self.finish(context)
-            return {'FINISHED'}
+
+        if event.type == 'TIMER':
+            self._runner.step()
+            self.text.progress_bar = int(round(self._runner.progress * 100, 2))
+
+            if self._runner.finished:
+                self.finish(context)
+                return {'FINISHED'}
 
         return {'PASS_THROUGH'}
 
     def execute(self, context):
         wm = context.window_manager
-        self._timer = wm.event_timer_add(0.1, window=context.window)
+        self._timer = wm.event_timer_add(self.timer_interval, window=context.window)
         wm.modal_handler_add(self)
-        
-        self._th = threading.Thread(target=self.create_cubes, args=())
-        
+
+        if self.trace_path:
+            tracing.enable(self.trace_path)
+        self._runner = JobRunner(self.create_cubes(), self.total_cubes, self.budget_ms)
+
         self.text = context.space_data.text
         self.text.show_progress_bar = True
         self.text.progress_bar = 0
-        self._th.start()
         return {'RUNNING_MODAL'}
 
     def finish(self, context):
         wm = context.window_manager
         wm.event_timer_remove(self._timer)
         self.text.show_progress_bar = False
+        if tracing.is_enabled():
+            tracing.print_summary(tracing.disable())
         print("FINISHED")
 
 
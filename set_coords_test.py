@@ -1,13 +1,22 @@
-from typing import Tuple
+from typing import Dict, List, Tuple
 import bpy,numpy as np
 from bpy.types import Mesh, Object, GeometryNodeTree, NodesModifier, Attribute, GeometryNodeGroup
-import timeit
 from timeit import default_timer as dt
+from mesh_buffers import as_float
+import benchmark
+import tracing
 
 is_fields = bpy.data.version >= (3,0,0)
 
 def set_py(me:Mesh, coords:np.ndarray) -> None:
-    me.vertices.foreach_set("co",coords.flatten())
+    me.vertices.foreach_set("co", as_float(coords))
+
+
+@benchmark.coords_method("FROM FOREACH_SET")
+def set_py_obj(obj:'Object', coords:np.ndarray) -> None:
+    """Set the coordinates of obj's mesh and tag it so it gets redrawn"""
+    set_py(obj.data, coords)
+    obj.data.update_tag()
 
 def ensure_geo_setter() -> Tuple[GeometryNodeTree,str]:
     """Ensure a Geometry NodeTree named 'Set Coords' exists
@@ -19,7 +28,10 @@ def ensure_geo_setter() -> Tuple[GeometryNodeTree,str]:
     """
     ng = bpy.data.node_groups.get("Set Coords")
     if ng:
-        return (ng, ng.inputs[-1].identifier)
+        if ng.get("sets_position"):
+            return (ng, ng.inputs[-1].identifier)
+        # Older trees offset the positions instead of setting them
+        bpy.data.node_groups.remove(ng)
     
     # Create and Setup
     ng = bpy.data.node_groups.new("Set Coords", "GeometryNodeTree")
@@ -42,11 +54,11 @@ def ensure_geo_setter() -> Tuple[GeometryNodeTree,str]:
             inp_node.outputs['Geometry'],
             set_pos_node.inputs['Geometry']
         )
-        # From Group Input to Set Position - Offset
-        ng.inputs.new("NodeSocketString", "Offset")
+        # From Group Input to Set Position - Position
+        ng.inputs.new("NodeSocketString", "Position")
         links.new(
-            inp_node.outputs['Offset'],
-            set_pos_node.inputs['Offset']
+            inp_node.outputs['Position'],
+            set_pos_node.inputs['Position']
         )
         # From Set Position to Group Output - Geometry
         ng.outputs.new("NodeSocketGeometry", "Geometry")
@@ -75,36 +87,66 @@ def ensure_geo_setter() -> Tuple[GeometryNodeTree,str]:
             out_node.inputs['Geometry']
         )
 
-        # Factor - NodeSocketFloatFactor
-        set_pos_node.inputs[2].default_value = 0.0
+        # Factor - NodeSocketFloatFactor, 1.0 takes B as is
+        set_pos_node.inputs[2].default_value = 1.0
         # A - NodeSocketString
         set_pos_node.inputs[3].default_value = 'position'
         # Result - NodeSocketString
         set_pos_node.inputs[11].default_value = 'position'
 
+    ng["sets_position"] = True
     return (ng, ng.inputs[-1].identifier)
-def set_geo_nodes(obj:'Object', coords:np.ndarray) -> None:
+
+
+def add_geo_setter(obj:'Object', attr_name:str='setter_coords') -> NodesModifier:
+    """Add a 'Coords Setter' modifier using the 'Set Coords' node tree
+
+    Parameters
+    ----------
+    obj : Object
+    attr_name : str
+        Name of the point attribute the node tree reads the coordinates from
+
+    Returns
+    -------
+    NodesModifier
+        The new modifier
+    """
     # Ensure Geo NodeTree Exists
-    ng, attr_id = ensure_geo_setter()
+    with tracing.span("get node group"):
+        ng, attr_id = ensure_geo_setter()
 
     # Add Geo Nodes Modifier
-    mod: NodesModifier = obj.modifiers.new('Coords Setter', 'NODES')
-    bpy.data.node_groups.remove(mod.node_group)
-    mod.node_group = ng
+    with tracing.span("add modifier"):
+        mod: NodesModifier = obj.modifiers.new('Coords Setter', 'NODES')
+        if mod.node_group:
+            bpy.data.node_groups.remove(mod.node_group)
+        mod.node_group = ng
 
-    # Set Attribute in PY
-    attr:Attribute = obj.data.attributes.new('setter_coords','FLOAT_VECTOR','POINT')
-    attr.data.foreach_set('vector', coords.flatten())
+        # Set Attribute in Geo Nodes
+        if is_fields:
+            mod[f'{attr_id}_use_attribute'] = 1
+            attr_id = f'{attr_id}_attribute_name'
+        mod[attr_id] = attr_name
+    return mod
 
-    # Set Attribute in Geo Nodes
-    if is_fields:
-        mod[f'{attr_id}_use_attribute'] = 1
-        attr_id = f'{attr_id}_attribute_name'
-    mod[attr_id] = 'setter_coords'
 
-    # Apply Geo Nodes Modifier
-    dg = bpy.context.evaluated_depsgraph_get()
-    me = bpy.data.meshes.new_from_object(obj.evaluated_get(dg))
+def write_setter_coords(me:Mesh, coords:np.ndarray, attr_name:str='setter_coords') -> None:
+    """Write `coords` into the point attribute the setter modifier reads, creating it if missing"""
+    attr:Attribute = me.attributes.get(attr_name) or me.attributes.new(attr_name,'FLOAT_VECTOR','POINT')
+    attr.data.foreach_set('vector', as_float(coords))
+
+
+def replace_mesh(obj:'Object', mod:NodesModifier, me:Mesh, attr_name:str=None) -> None:
+    """Remove the modifier and swap the object's mesh for `me`
+
+    The old mesh is removed and its name given to the new mesh. Set Position
+    passes attributes through, so `attr_name` is removed from the new mesh
+    """
+    if attr_name:
+        attr = me.attributes.get(attr_name)
+        if attr:
+            me.attributes.remove(attr)
     obj.modifiers.remove(mod)
     mesh_to_remove = obj.data
     mesh_name = mesh_to_remove.name
@@ -113,45 +155,164 @@ def set_geo_nodes(obj:'Object', coords:np.ndarray) -> None:
     me.name = mesh_name
 
 
-def set_geo_nodes_timed(obj: 'Object', coords: np.ndarray) -> None:
-    # ng_time = 0.0
-    # py_set = 0.0
-    st = dt()
-    # Ensure Geo NodeTree Exists
-    ng, attr_id = ensure_geo_setter()
-    print("Get NG:",dt()-st)
+def apply_geo_setter(obj:'Object', mod:NodesModifier, depsgraph=None, attr_name:str=None) -> Mesh:
+    """Apply the modifier by swapping the object's mesh for the evaluated one
+
+    Parameters
+    ----------
+    obj : Object
+    mod : NodesModifier
+    depsgraph : Depsgraph, None (Optional)
+        An already evaluated depsgraph. If None the context's one is evaluated
+    attr_name : str, None (Optional)
+        Attribute the modifier read, removed from the new mesh
 
+    Returns
+    -------
+    Mesh
+        The new mesh of the object
+    """
+    with tracing.span("depsgraph evaluate"):
+        if depsgraph is None:
+            depsgraph = bpy.context.evaluated_depsgraph_get()
+        obj_eval = obj.evaluated_get(depsgraph)
+    with tracing.span("apply"):
+        me = bpy.data.meshes.new_from_object(obj_eval)
+        replace_mesh(obj, mod, me, attr_name)
+    return me
+
+
+@benchmark.coords_method("GEO NODE")
+@tracing.traced("set_geo_nodes")
+def set_geo_nodes(obj:'Object', coords:np.ndarray) -> None:
     # Add Geo Nodes Modifier
-    st = dt()
-    mod: NodesModifier = obj.modifiers.new('Coords Setter', 'NODES')
-    bpy.data.node_groups.remove(mod.node_group)
-    mod.node_group = ng
-    print("Add Mod:", dt()-st)
+    mod = add_geo_setter(obj)
 
     # Set Attribute in PY
-    st = dt()
-    attr: Attribute = obj.data.attributes.new(
-        'setter_coords', 'FLOAT_VECTOR', 'POINT')
-    attr.data.foreach_set('vector', coords.flatten())
-    print("Set attr:", dt()-st)
-
-    # Set Attribute in Geo Nodes
-    if is_fields:
-        mod[f'{attr_id}_use_attribute'] = 1
-        attr_id = f'{attr_id}_attribute_name'
-    mod[attr_id] = 'setter_coords'
+    with tracing.span("set attribute"):
+        write_setter_coords(obj.data, coords)
 
     # Apply Geo Nodes Modifier
-    st = dt()
-    dg = bpy.context.evaluated_depsgraph_get()
-    me = bpy.data.meshes.new_from_object(obj.evaluated_get(dg))
-    obj.modifiers.remove(mod)
-    mesh_to_remove = obj.data
-    mesh_name = mesh_to_remove.name
-    obj.data = me
-    bpy.data.meshes.remove(mesh_to_remove)
-    me.name = mesh_name
-    print("Apply Mod:", dt()-st)
+    apply_geo_setter(obj, mod, attr_name='setter_coords')
+
+
+def _check_batch(coords_by_object:Dict['Object', np.ndarray]) -> None:
+    meshes = {obj.data for obj in coords_by_object}
+    if len(meshes) != len(coords_by_object):
+        raise ValueError("Objects in a batch can't share meshes")
+
+
+def set_py_batch(coords_by_object:Dict['Object', np.ndarray]) -> None:
+    """Set the coordinates of many objects with `foreach_set`
+
+    Meshes are only tagged, they are all evaluated together on the next
+    depsgraph update
+    """
+    _check_batch(coords_by_object)
+    for obj, coords in coords_by_object.items():
+        me: Mesh = obj.data
+        set_py(me, coords)
+        me.update_tag()
+
+
+@tracing.traced("set_geo_nodes_batch")
+def set_geo_nodes_batch(coords_by_object:Dict['Object', np.ndarray]) -> None:
+    """Set the coordinates of many objects with a single depsgraph evaluation
+
+    Modifiers and attributes are set up on every object first. Then the
+    depsgraph is evaluated once and every result is copied out before any
+    mesh is swapped, so removing meshes can't invalidate the evaluation
+    """
+    _check_batch(coords_by_object)
+    modifiers = []
+    for obj, coords in coords_by_object.items():
+        mod = add_geo_setter(obj)
+        with tracing.span("set attribute"):
+            write_setter_coords(obj.data, coords)
+        modifiers.append((obj, mod))
+
+    with tracing.span("depsgraph evaluate"):
+        dg = bpy.context.evaluated_depsgraph_get()
+    with tracing.span("new from object"):
+        meshes = [bpy.data.meshes.new_from_object(obj.evaluated_get(dg)) for obj, _ in modifiers]
+    with tracing.span("apply"):
+        for (obj, mod), me in zip(modifiers, meshes):
+            replace_mesh(obj, mod, me, 'setter_coords')
+
+
+class GeoCoordsSetter:
+    """Long-lived geometry nodes coordinate setter bound to an object
+
+    The 'Coords Setter' modifier and the 'setter_coords' attribute are
+    installed once. Each `update` only rewrites the attribute and tags the
+    mesh, the modifier result is only written into the mesh on `bake`.
+    """
+    attr_name = 'setter_coords'
+
+    def __init__(self, obj:'Object') -> None:
+        self.obj = obj
+        self.modifier: NodesModifier = None
+        self.install()
+
+    def install(self) -> None:
+        """Install the modifier and attribute if they are missing"""
+        obj = self.obj
+        self.modifier = obj.modifiers.get('Coords Setter')
+        if self.modifier is None:
+            self.modifier = add_geo_setter(obj, self.attr_name)
+        if obj.data.attributes.get(self.attr_name) is None:
+            obj.data.attributes.new(self.attr_name, 'FLOAT_VECTOR', 'POINT')
+
+    def update(self, coords:np.ndarray) -> None:
+        """Write `coords` into the attribute and tag the mesh for re-evaluation"""
+        if self.modifier is None:
+            self.install()
+        me: Mesh = self.obj.data
+        # Look the attribute up every time, references go stale when the mesh reallocates
+        with tracing.span("set attribute"):
+            attr: Attribute = me.attributes[self.attr_name]
+            attr.data.foreach_set('vector', as_float(coords))
+        me.update_tag()
+
+    def bake(self) -> Mesh:
+        """Apply the current modifier result to the object's mesh
+
+        The modifier and attribute are removed, the next `update` installs them again
+
+        Returns
+        -------
+        Mesh
+            The new mesh of the object
+        """
+        if self.modifier is None:
+            return self.obj.data
+        me = apply_geo_setter(self.obj, self.modifier, attr_name=self.attr_name)
+        self.modifier = None
+        return me
+
+    def remove(self) -> None:
+        """Remove the modifier and attribute without applying them"""
+        obj = self.obj
+        if self.modifier is not None:
+            obj.modifiers.remove(self.modifier)
+            self.modifier = None
+        attr = obj.data.attributes.get(self.attr_name)
+        if attr:
+            obj.data.attributes.remove(attr)
+
+
+# Object name -> setter, for set_geo_setter
+_geo_setters: Dict[str, GeoCoordsSetter] = {}
+
+
+@benchmark.coords_method("GEO NODE SETTER")
+def set_geo_setter(obj:'Object', coords:np.ndarray) -> None:
+    """Update through a GeoCoordsSetter kept per object and evaluate the result"""
+    setter = _geo_setters.get(obj.name)
+    if setter is None or setter.obj != obj:
+        setter = _geo_setters[obj.name] = GeoCoordsSetter(obj)
+    setter.update(coords)
+    bpy.context.evaluated_depsgraph_get()
 
 
 def create_plane(x: int, y: int) -> Object:
@@ -206,46 +367,39 @@ def create_plane(x: int, y: int) -> Object:
     return obj
 
 
-def mytimeit(title, SETUP_CODE, TEST_CODE, repeat, number):
-    # timeit.repeat statement
-    times = timeit.repeat(setup=SETUP_CODE,
-                          stmt=TEST_CODE,
-                          repeat=repeat,
-                          number=number)
-
-    # Print out Results
-    avg = sum(times)/len(times)
-    error_range = max(times) - avg
-    print(
-        f'{title}: {round(avg,2)} s ± {round(error_range,3)} s per loop')
-    print(f'    (mean ± std. dev. of {repeat} runs, {number} loops each)')
-    print(f'    (Min:{min(times)} | Max:{max(times)})')
+def batch_time(num_objects: int, x: int, y: int, repeat: int, number: int) -> List[benchmark.BenchmarkResult]:
+    """Time updating `num_objects` x*y planes in a batch against looping over `set_geo_nodes`
 
-
-def bpy_py_time(me_name:str, x:int, y:int, repeat, number):
-    """Time bpy mesh ops vertex coordinate setting"""
-    SETUP_CODE = f'''
-import bpy, numpy as np
-from __main__ import set_py
-is_fields = bpy.data.version >= (3,0,0)
-coords = np.random.random({x*y*3})
-me = bpy.data.meshes.get('{me_name}')'''
-    TEST_CODE = 'set_py(me, coords)'
-
-    mytimeit("FROM FOREACH_SET", SETUP_CODE, TEST_CODE, repeat, number)
-
-
-def geo_node_time(obj_name:str, x:int, y:int, repeat, number):
-    """Time geo nodes vertex coordinate setting"""
-    SETUP_CODE = f'''
-import bpy, numpy as np
-from __main__ import set_geo_nodes
-is_fields = bpy.data.version >= (3,0,0)
-coords = np.random.random({x*y*3})
-obj = bpy.data.objects.get('{obj_name}')'''
-    TEST_CODE = f'set_geo_nodes(obj, coords)'
-
-    mytimeit("GEO NODE", SETUP_CODE, TEST_CODE, repeat, number)
+    The planes are created for the timing and removed again
+    """
+    objects = [create_plane(x, y) for _ in range(num_objects)]
+    coords_by_object = {obj: np.random.random(x*y*3) for obj in objects}
+    vertex_count = sum(len(obj.data.vertices) for obj in objects)
+
+    def loop_geo_nodes():
+        for obj, coords in coords_by_object.items():
+            set_geo_nodes(obj, coords)
+
+    def foreach_set_batch():
+        # Include the evaluation set_geo_nodes_batch pays for
+        set_py_batch(coords_by_object)
+        bpy.context.evaluated_depsgraph_get()
+
+    print("NUM OF OBJECTS:", num_objects, "| NUM OF VERTS:", vertex_count)
+    results = []
+    for title, func in (
+            ("LOOP GEO NODE", loop_geo_nodes),
+            ("GEO NODE BATCH", lambda: set_geo_nodes_batch(coords_by_object)),
+            ("FOREACH_SET BATCH", foreach_set_batch)):
+        result = benchmark.run(title, func, (), "batch", vertex_count, repeat, number)
+        benchmark.print_result(result)
+        results.append(result)
+
+    for obj in objects:
+        me = obj.data
+        bpy.data.objects.remove(obj)
+        bpy.data.meshes.remove(me)
+    return results
 
 
 if __name__ == "__main__":
@@ -254,6 +408,35 @@ if __name__ == "__main__":
     y = 100
     runs = 3
     loops = 100
+    # Where to write the results, .json or .csv. Empty to skip
+    results_path = ""
+    # Run every method over a range of grid sizes instead of just x*y
+    sweep = False
+    sweep_loops = 3
+    # Where to write the Chrome trace of the detailed timings. Empty to skip
+    trace_path = ""
+    # Number of planes updated together in the batch timings. 0 to skip
+    batch_objects = 50
+    batch_loops = 3
+
+    def remove_plane(obj:'Object') -> None:
+        _geo_setters.pop(obj.name, None)
+        me = obj.data
+        bpy.data.objects.remove(obj)
+        bpy.data.meshes.remove(me)
+
+    if sweep:
+        print(" SWEEP ".center(60, "-"))
+        sweep_results = benchmark.sweep_coords_methods(
+            benchmark.sweep_sides(),
+            lambda side: create_plane(side, side),
+            remove_plane,
+            runs,
+            sweep_loops,
+        )
+        benchmark.print_scaling(sweep_results)
+        if results_path:
+            benchmark.write_results(sweep_results, results_path)
 
     obj = create_plane(x, y)
 
@@ -261,11 +444,20 @@ if __name__ == "__main__":
     print(" STARTING ".center(60, "-"))
     print("NUM OF VERTS:",len(obj.data.vertices))
 
-    bpy_py_time(obj.data.name, x, y, runs, loops)
+    coords = np.random.random(x*y*3)
+
+    results = benchmark.run_coords_methods(obj, coords, runs, loops)
+    setter = _geo_setters.pop(obj.name, None)
+    if setter:
+        setter.bake()
 
-    geo_node_time(obj.name, x, y, runs, loops)
+    if batch_objects:
+        print()
+        print(" Batch Timings:".rjust(60, '-'))
+        results += batch_time(batch_objects, x, y, runs, batch_loops)
 
-    coords = np.random.random(x*y*3)
+    if results_path and not sweep:
+        benchmark.write_results(results, results_path)
 
     print()
     print(" Single Py Ops Timings:".rjust(60, '-'))
@@ -275,9 +467,9 @@ if __name__ == "__main__":
 
     print()
     print(" Single Geo Nodes Detailed Timings:".rjust(60,'-'))
-    st = dt()
-    set_geo_nodes_timed(obj, coords)
-    print(" Total Timings:".rjust(30, '-'), dt()-st)
+    tracing.enable(trace_path)
+    set_geo_nodes(obj, coords)
+    tracing.print_summary(tracing.disable())
 
     bpy.data.meshes.remove(obj.data)
 
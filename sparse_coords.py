@@ -0,0 +1,114 @@
+import bpy
+import numpy as np
+from bpy.types import Mesh
+from typing import Iterable, List
+import mesh_buffers
+from mesh_snapshot import MeshSnapshot, snapshot
+from set_coords_test import set_py
+import benchmark
+
+# Edits touching less than this fraction of the vertices are written vertex by vertex
+SPARSE_THRESHOLD = 0.01
+
+
+class SparseCoordsUpdater:
+    """Apply (indices, positions) edits to a mesh's coordinates
+
+    The Python API has no partial `foreach_set`, an upload always covers
+    every vertex. A float32 mirror of the coordinates is kept instead. Edits
+    smaller than `threshold` of the mesh are written through
+    `vertices[i].co`, whose cost grows with the edit size. Larger edits are
+    scattered into the mirror and uploaded with a single `foreach_set`.
+    """
+
+    def __init__(self, mesh: Mesh, threshold: float = SPARSE_THRESHOLD) -> None:
+        self.mesh = mesh
+        self.threshold = threshold
+        self.mirror: MeshSnapshot = snapshot(mesh)
+
+    def refresh(self) -> None:
+        """Re-read the mirror, needed after anything else changed the mesh"""
+        snapshot(self.mesh, out=self.mirror)
+
+    def update(self, indices: np.ndarray, positions: np.ndarray) -> None:
+        """Move the vertices at `indices` to `positions`
+
+        Parameters
+        ----------
+        indices : np.ndarray
+            Vertex indices, the last position wins for repeated ones
+        positions : np.ndarray
+            New coordinates shaped (len(indices), 3) or flat
+        """
+        indices = np.asarray(indices).reshape(-1)
+        positions = np.asarray(positions).reshape(-1, 3)
+        if len(indices) != len(positions):
+            raise ValueError(f"Got {len(positions)} positions for {len(indices)} indices")
+        if not len(indices):
+            return
+
+        co = self.mirror.co
+        if len(co) != len(self.mesh.vertices):
+            raise ValueError("The mesh changed size, call refresh first")
+        co[indices] = positions
+
+        if len(indices) < self.threshold * len(co):
+            vertices = self.mesh.vertices
+            # Read back from the mirror so repeated indices match the full upload
+            for index, position in zip(indices.tolist(), co[indices].tolist()):
+                vertices[index].co = position
+        else:
+            set_py(self.mesh, co)
+        self.mesh.update_tag()
+
+
+def sparse_time(mesh: Mesh, fractions: Iterable[float], repeat: int, number: int) -> List[benchmark.BenchmarkResult]:
+    """Time per vertex writes against a full upload for edits of increasing size
+
+    The results' vertex count is the edit size, so the crossover printed at
+    the end is where `SPARSE_THRESHOLD` should be for this mesh
+    """
+    num_verts = len(mesh.vertices)
+    sparse = SparseCoordsUpdater(mesh, threshold=1.0)
+    full = SparseCoordsUpdater(mesh, threshold=0.0)
+
+    results = []
+    for fraction in fractions:
+        indices = np.random.choice(num_verts, max(1, int(num_verts * fraction)), replace=False)
+        positions = sparse.mirror.co[indices] + mesh_buffers.FLOAT(0.01)
+        print(f"EDITED VERTS: {len(indices)} ({fraction:.2%})")
+        for title, updater in (("PER VERTEX", sparse), ("FULL FOREACH_SET", full)):
+            result = benchmark.run(title, updater.update, (indices, positions), "sparse", len(indices), repeat, number)
+            benchmark.print_result(result)
+            results.append(result)
+    benchmark.print_scaling(results)
+    return results
+
+
+def check_sparse(mesh: Mesh) -> bool:
+    """Check that both write paths leave the mesh matching the mirror"""
+    original = snapshot(mesh).co.copy()
+    num_verts = len(mesh.vertices)
+    same = True
+    for threshold in (1.0, 0.0):
+        updater = SparseCoordsUpdater(mesh, threshold)
+        indices = np.random.randint(0, num_verts, max(1, num_verts // 50))
+        updater.update(indices, np.random.random((len(indices), 3)))
+        same &= np.array_equal(snapshot(mesh).co, updater.mirror.co)
+    set_py(mesh, original)
+    return bool(same)
+
+
+if __name__ == "__main__":
+    # Change These
+    runs = 3
+    loops = 10
+    fractions = (0.0001, 0.001, 0.01, 0.05, 0.2)
+
+    me: Mesh = bpy.context.object.data
+
+    print(" STARTING ".center(60, "-"))
+    print("NUM OF VERTS:", len(me.vertices))
+    print("SPARSE MATCHES FULL:", check_sparse(me))
+    sparse_time(me, fractions, runs, loops)
+    print(" FINISHED ".center(60, "-"))
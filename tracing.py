@@ -0,0 +1,109 @@
+"""Named timing spans written as Chrome trace events
+
+Open the written JSON in chrome://tracing or https://ui.perfetto.dev.
+While tracing is disabled `span` returns a shared no-op context manager and
+`traced` functions only pay for one global lookup.
+"""
+import json
+import os
+import threading
+from contextlib import nullcontext
+from functools import wraps
+from time import perf_counter
+from typing import Callable, Dict, List, Optional
+
+# Recorded events while enabled, None while disabled
+_events: Optional[List[dict]] = None
+_path: Optional[str] = None
+_NULL = nullcontext()
+
+
+class _Span:
+    __slots__ = ('name', 'args', 'start')
+
+    def __init__(self, name: str, args: dict) -> None:
+        self.name = name
+        self.args = args
+
+    def __enter__(self) -> '_Span':
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        end = perf_counter()
+        if _events is not None:
+            _events.append({
+                "name": self.name,
+                "ph": "X",
+                "ts": self.start * 1e6,
+                "dur": (end - self.start) * 1e6,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": self.args,
+            })
+
+
+def span(name: str, **args):
+    """Context manager timing a named phase, extra keywords end up in the event's args"""
+    if _events is None:
+        return _NULL
+    return _Span(name, args)
+
+
+def traced(name: str = None) -> Callable:
+    """Decorator timing every call of a function, named after it by default"""
+    def decorate(func: Callable) -> Callable:
+        label = name or func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if _events is None:
+                return func(*args, **kwargs)
+            with _Span(label, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def is_enabled() -> bool:
+    return _events is not None
+
+
+def enable(path: str = None) -> None:
+    """Start recording spans
+
+    Parameters
+    ----------
+    path : str, None (Optional)
+        Where `disable` writes the Chrome trace JSON. If None nothing is written
+    """
+    global _events, _path
+    _events = []
+    _path = path
+
+
+def disable() -> List[dict]:
+    """Stop recording, write the trace if a path was given and return the events"""
+    global _events, _path
+    events, path = _events or [], _path
+    _events = _path = None
+    if path:
+        write(events, path)
+    return events
+
+
+def write(events: List[dict], path: str) -> None:
+    """Write events as a Chrome trace JSON file"""
+    with open(path, 'w') as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+def print_summary(events: List[dict]) -> None:
+    """Print the total time of each span name, in order of first appearance"""
+    totals: Dict[str, List[float]] = {}
+    for event in sorted(events, key=lambda event: event["ts"]):
+        total = totals.setdefault(event["name"], [0.0, 0])
+        total[0] += event["dur"] / 1e6
+        total[1] += 1
+    for name, (seconds, calls) in totals.items():
+        print(f'{name}: {seconds:.6f} s ({calls} calls)')
@@ -0,0 +1,144 @@
+import os
+import bpy
+import numpy as np
+from bpy.types import Mesh, Scene
+from timeit import default_timer as dt
+from set_coords_test import set_py
+from mesh_snapshot import MeshSnapshot, set_if_changed, snapshot
+
+
+def open_vertex_cache(path: str, num_verts: int) -> np.ndarray:
+    """Memory map a vertex cache shaped (frames, verts, 3)
+
+    Parameters
+    ----------
+    path : str
+        A `.npy` file or a raw float32 file
+    num_verts : int
+        Number of vertices per frame, used to check `.npy` files and to
+        shape raw files
+
+    Returns
+    -------
+    np.ndarray
+        Read only memory mapped array, nothing is loaded until accessed
+    """
+    if path.endswith('.npy'):
+        cache = np.load(path, mmap_mode='r')
+    else:
+        cache = np.memmap(path, dtype=np.float32, mode='r')
+        cache = cache.reshape(-1, num_verts, 3)
+
+    if cache.ndim != 3 or cache.shape[1:] != (num_verts, 3):
+        raise ValueError(f"Vertex cache shape {cache.shape} does not match (frames, {num_verts}, 3)")
+    return cache
+
+
+class VertexCachePlayer:
+    """Push one frame of a memory mapped vertex cache into a mesh on frame change
+
+    Only the pages of the current frame are read from disk. float32 caches go
+    straight from the mapping to `foreach_set`, other dtypes are converted in a
+    reused buffer, so playback does not allocate per frame.
+
+    With a `tolerance`, frames where no vertex moved more than it are not
+    written and the mesh is not updated.
+    """
+
+    def __init__(self, mesh: Mesh, path: str, frame_start: int = 1, tolerance: float = None) -> None:
+        self.mesh_name = mesh.name
+        self.cache = open_vertex_cache(path, len(mesh.vertices))
+        self.frame_start = frame_start
+        self.last_frame = None
+        self.tolerance = tolerance
+        self._current: MeshSnapshot = None
+
+    @property
+    def frames(self) -> int:
+        return self.cache.shape[0]
+
+    def push(self, frame: int) -> None:
+        """Set the mesh's coordinates to the cached `frame`
+
+        Frames outside the cache hold the first or last cached frame
+        """
+        index = min(max(frame - self.frame_start, 0), self.frames - 1)
+        if index == self.last_frame:
+            return
+        me: Mesh = bpy.data.meshes.get(self.mesh_name)
+        if me is None:
+            return
+        if self.tolerance is None:
+            set_py(me, self.cache[index])
+            me.update()
+        else:
+            if self._current is None or len(self._current.co) != len(me.vertices):
+                self._current = snapshot(me)
+            if len(set_if_changed(me, self.cache[index], self._current, self.tolerance)):
+                me.update()
+        self.last_frame = index
+
+    def _frame_change_pre(self, scene: Scene, *args) -> None:
+        self.push(scene.frame_current)
+
+    def start(self) -> None:
+        """Start following the scene's current frame"""
+        if self._frame_change_pre not in bpy.app.handlers.frame_change_pre:
+            bpy.app.handlers.frame_change_pre.append(self._frame_change_pre)
+
+    def stop(self) -> None:
+        """Stop following the scene's current frame"""
+        if self._frame_change_pre in bpy.app.handlers.frame_change_pre:
+            bpy.app.handlers.frame_change_pre.remove(self._frame_change_pre)
+
+
+def write_random_cache(path: str, frames: int, num_verts: int) -> None:
+    """Write a random float32 `.npy` vertex cache without holding it in memory"""
+    cache = np.lib.format.open_memmap(path, mode='w+', dtype=np.float32, shape=(frames, num_verts, 3))
+    for frame in range(frames):
+        cache[frame] = np.random.random((num_verts, 3))
+    cache.flush()
+    del cache
+
+
+def playback_time(player: VertexCachePlayer, scene: Scene) -> None:
+    """Print the sustained frames/second of pushing every cached frame
+
+    Measured once with the push alone and once through `scene.frame_set`,
+    which also runs the handlers and evaluates the depsgraph
+    """
+    frames = range(player.frame_start, player.frame_start + player.frames)
+
+    player.last_frame = None
+    st = dt()
+    for frame in frames:
+        player.push(frame)
+    total = dt() - st
+    print(f'PUSH: {round(len(frames)/total, 2)} frames/s ({len(frames)} frames in {round(total, 3)} s)')
+
+    player.last_frame = None
+    player.start()
+    st = dt()
+    for frame in frames:
+        scene.frame_set(frame)
+    total = dt() - st
+    player.stop()
+    print(f'FRAME SET: {round(len(frames)/total, 2)} frames/s ({len(frames)} frames in {round(total, 3)} s)')
+
+
+if __name__ == "__main__":
+    # Change These
+    frames = 250
+    path = os.path.join(bpy.app.tempdir, "vertex_cache.npy")
+
+    C = bpy.context
+    me: Mesh = C.object.data
+
+    print(" STARTING ".center(60, "-"))
+    print("NUM OF VERTS:", len(me.vertices))
+
+    write_random_cache(path, frames, len(me.vertices))
+    player = VertexCachePlayer(me, path, C.scene.frame_start)
+    playback_time(player, C.scene)
+
+    print(" FINISHED ".center(60, "-"))